@@ -1,311 +1,299 @@
+import time
+
+# Start of this script run, including the imports below on a cold start
+script_started = time.perf_counter()
+
+import os
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from gtts import gTTS
-import mysql.connector
-import os
-
-# Database AW connection details from secrets
-host = st.secrets.database.host
-port = st.secrets.database.port
-database = st.secrets.database.database
-username = st.secrets['database']['username']
-password = st.secrets.database.password
-
-# Connect to the database
-conn = mysql.connector.connect(
-    host=host,
-    port=port,
-    database=database,
-    user=username,
-    password=password
-)
-
-# Load the data
-data = pd.read_csv("dataset/imdbscrap.csv", sep=";")
-
-# Comparison
-def comparisonaw(conn):
-    cursor = conn.cursor()
-    query = """
-        SELECT DepartmentName,
-               COUNT(EmployeeKey) AS employee_count
-        FROM dimemployee
-        GROUP BY DepartmentName
-    """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    df = pd.DataFrame(rows, columns=[desc[0] for desc in cursor.description])
-
-    # Fill missing values with 0
-    df['employee_count'] = df['employee_count'].fillna(0)
-    
-    fig = px.bar(df, y='DepartmentName', x='employee_count', 
-                 labels={'DepartmentName': 'Department Name', 'employee_count': 'Employee Count'}, 
-                 color_discrete_sequence=['gold'])
-
-    fig.update_layout(
-        yaxis_title='Department Name',
-        xaxis_title='Employee Count',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(color='white', size=14),
-        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+import charts
+import queries
+import tracing
+from content import explanations, sections
+from db_pool import ConnectionPool
+from imdb_agg import load_aggregates
+from last_good import LastGoodStore
+from query_cache import QueryCache
+from scheduler import QueryScheduler
+from snapshot import Snapshot, aw_charts, snapshot_directory
+from tts import TTSCache, make_synthesizer
+
+
+
+# Read an optional setting from secrets, falling back to a default
+def get_setting(section, key, default):
+    try:
+        return st.secrets[section][key]
+    except (KeyError, FileNotFoundError):
+        return default
+
+
+# Connection pool for the AW database, shared by every session of this server process
+@st.cache_resource
+def get_pool():
+    return ConnectionPool(
+        size=get_setting('pool', 'size', 5),
+        checkout_timeout=get_setting('pool', 'checkout_timeout', 10),
+        query_timeout=get_setting('pool', 'query_timeout', 30),
+        host=st.secrets.database.host,
+        port=st.secrets.database.port,
+        database=st.secrets.database.database,
+        user=st.secrets['database']['username'],
+        password=st.secrets.database.password,
     )
 
-    st.plotly_chart(fig)
-
-# Relationship
-def relationshipaw(conn):
-    cursor = conn.cursor()
-    query = """
-        SELECT pc.EnglishProductCategoryName AS category, 
-               fs.SalesAmount
-        FROM factinternetsales fs
-        JOIN dimproduct dp ON fs.ProductKey = dp.ProductKey
-        JOIN dimproductsubcategory dps ON dp.ProductSubcategoryKey = dps.ProductSubcategoryKey
-        JOIN dimproductcategory pc ON dps.ProductCategoryKey = pc.ProductCategoryKey;
-    """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    df = pd.DataFrame(rows, columns=[desc[0] for desc in cursor.description])
-
-    # Create a scatter plot
-    fig = px.scatter(df, x='category', y='SalesAmount', 
-                     labels={'category': 'Product Category', 'SalesAmount': 'Sales Amount'},
-                     color_discrete_sequence=['gold'],
-                     opacity=0.75)
-
-    fig.update_layout(
-        xaxis_title='Product Category',
-        yaxis_title='Sales Amount (US$)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(color='white', size=14),
-        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)', tickmode='array', tickvals=df['category'].unique()),
-        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    )
 
-    # Display the chart
-    st.plotly_chart(fig)
-
-# Composition
-def compositionaw(conn):
-    cursor = conn.cursor()
-    query = """
-        SELECT 
-            st.SalesTerritoryRegion AS region,
-            COUNT(r.ResellerKey) AS reseller_count
-        FROM 
-            dimreseller r
-        JOIN 
-            dimgeography g ON r.GeographyKey = g.GeographyKey
-        JOIN 
-            dimsalesterritory st ON g.SalesTerritoryKey = st.SalesTerritoryKey
-        GROUP BY 
-            st.SalesTerritoryRegion;
-    """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    df = pd.DataFrame(rows, columns=[desc[0] for desc in cursor.description])
-
-    # Plotting the pie chart
-    fig = px.pie(df, values='reseller_count', names='region',
-                 hole=0.5,
-                 color_discrete_sequence=['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d', '#ffefa1', '#fff2b5'])
-
-    fig.update_traces(textinfo='percent+label', pull=0.05)
-    fig.update_layout(
-        font=dict(color='white', size=12),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+# Query result cache shared by every session of this server process
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(
+        ttl=get_setting('cache', 'ttl', 3600),
+        max_bytes=get_setting('cache', 'max_mb', 256) * 1024 * 1024,
     )
 
-    # Display the chart
-    st.plotly_chart(fig)
-
-# Distribution
-def distributionaw(conn):
-    cursor = conn.cursor()
-    query = """
-        SELECT
-            dt.CalendarYear,
-            dt.EnglishMonthName,
-            SUM(fis.OrderQuantity) AS OrderQuantity
-        FROM
-            factinternetsales fis
-        JOIN
-            dimtime dt ON fis.OrderDateKey = dt.TimeKey
-        WHERE
-            dt.CalendarYear BETWEEN 2001 AND 2004
-        GROUP BY
-            dt.CalendarYear, dt.EnglishMonthName, dt.MonthNumberOfYear
-        ORDER BY
-            dt.CalendarYear, dt.MonthNumberOfYear;
-    """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    df = pd.DataFrame(rows, columns=[desc[0] for desc in cursor.description])
-
-    # Create a new column to combine year and month
-    df['YearMonth'] = df['CalendarYear'].astype(str) + ' ' + df['EnglishMonthName']
-
-    # Plot the bar chart using Plotly
-    fig = go.Figure(data=[go.Bar(
-        x=df['YearMonth'], 
-        y=df['OrderQuantity'],
-        marker_color='gold'
-    )])
-    
-    fig.update_layout(
-        xaxis_title='Month',
-        yaxis_title='Order Quantity',
-        xaxis=dict(
-            tickangle=-45,
-            tickmode='array',
-            tickvals=df['YearMonth']
-        ),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(
-            color='white',
-            size=12,
-            weight='bold'
-        )
-    )
-    
-    st.plotly_chart(fig)
-
-
-# Comparison
-def comparisonimdb(data):
-    # Count the number of movies for each label
-    count_by_label = data['label'].value_counts().reset_index()
-    count_by_label.columns = ['label', 'count']
-
-    # Set palette colors
-    colors = ['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d', '#ffefa1', '#fff2b5']
-
-    # Create the bar chart using Plotly
-    fig = px.bar(count_by_label, x='label', y='count', 
-                 labels={'label': 'Label', 'count': 'Number of Movies'},
-                 color='label', color_discrete_sequence=colors)
-
-    fig.update_layout(
-        xaxis=dict(title='Label', color='white', tickfont=dict(color='white')),
-        yaxis=dict(title='Number of Movies', color='white', tickfont=dict(color='white')),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(color='white', size=12),
-    )
 
-    # Display the chart
-    st.plotly_chart(fig)
-
-# Relationship
-def relationshipimdb(data):
-    # Convert release_year to integer and rating to float
-    data['release_year'] = data['release_year'].astype(int)
-    data['rating'] = data['rating'] / 10.0
-
-    # Create scatter plot
-    fig = px.scatter(data, x='release_year', y='rating', 
-                     labels={'release_year': 'Release Year', 'rating': 'Rating'},
-                     color_discrete_sequence=['gold'],
-                     opacity=0.5)
-
-    fig.update_layout(
-        xaxis_title='Release Year',
-        yaxis_title='Rating',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(color='white', size=14),
-        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
-    )
+# Thread pool that loads the AW charts in parallel
+@st.cache_resource
+def get_scheduler():
+    return QueryScheduler(max_workers=get_setting('pool', 'size', 5))
+
+
+# Figures shared by every session, rebuilt only when their data changes
+@st.cache_resource
+def get_figure_cache():
+    return charts.FigureCache()
+
+
+# Last known good AW results, shown while the database is slow or down
+@st.cache_resource
+def get_last_good():
+    return LastGoodStore(get_setting('fallback', 'directory', '.last_good'))
+
+
+def figure_to_json(fig):
+    return fig.to_json()
+
+
+def figure_from_json(data):
+    import plotly.io as pio
 
-    # Display the chart
-    st.plotly_chart(fig)
+    return pio.from_json(data)
 
-# Composition
-def compositionimdb(data):
-    # Calculate total budget for each label
-    total_budget_by_label = data.groupby('label')['budget'].sum()
 
-    # Calculate total budget overall
-    total_budget_all = data['budget'].sum()
+# Load a chart's data and build its figure, traced under the chart's name.
+# The figure is reused while the data is the same (cached) object.
+def build_chart(name, query, figure, figures):
+    with tracing.chart(name):
+        data = query()
 
-    # Calculate proportions for each label
-    proportions = total_budget_by_label / total_budget_all
+        def build():
+            with tracing.span('figure'):
+                return figure(data)
 
-    # Sort proportions from largest to smallest
-    proportions_sorted = proportions.sort_values(ascending=False)
+        return figures.get_or_build(name, data, build)
 
-    # Set palette colors
-    colors = ['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d']
 
-    # Create pie chart
-    fig = go.Figure(data=[go.Pie(
-        labels=proportions_sorted.index,
-        values=proportions_sorted.values,
-        hole=0.5,
-        textinfo='percent+label',
-        marker=dict(colors=colors),
-    )])
+# Draw a figure into `target` (the page, a column or a placeholder). The
+# size of the figure sent to the browser is measured in a span of its own,
+# only while tracing, so the serialization is not counted as render time.
+# `variant` tells apart the figures a chart can get in one rerun (its last
+# known good one, then the fresh one) so their element keys never collide.
+def render_chart(target, name, fig, variant='fresh'):
+    with tracing.chart(name):
+        with tracing.span('render'):
+            target.plotly_chart(fig, key=f"{name}-{variant}")
+            tracing.chart_drawn()
+        with tracing.span('payload') as span:
+            if span.enabled:
+                span.set(bytes=len(fig.to_json()))
 
-    fig.update_layout(
-        font=dict(color='white', size=12),
-        margin=dict(t=10, b=10),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
+
+def stale_caption(message, saved):
+    return f"{message} Showing data from {time.strftime('%Y-%m-%d %H:%M', time.localtime(saved))}."
+
+
+# Draw the last known good figure of a chart with the time it is from.
+# Returns the caption's placeholder, so the message can be changed later
+# without drawing the figure again.
+def render_stale(target, name, entry, message):
+    fig, saved = entry
+    container = target.container()
+    render_chart(container, name, fig, variant='stale')
+    caption = container.empty()
+    caption.caption(stale_caption(message, saved))
+    return caption
+
+
+# Filter options for the sidebar. The last options seen are used right away
+# and refreshed in the background; only the very first run waits up to
+# `wait` seconds for the database, then falls back to the default years.
+def aw_filter_options(db, last_good, wait):
+    def load():
+        years = queries.run(db, 'order_years')
+        options = {
+            'years': [int(years['year_from'].iloc[0]), int(years['year_to'].iloc[0])],
+            'categories': list(queries.run(db, 'product_categories')['category'].astype(str)),
+            'territories': list(queries.run(db, 'territory_groups')['territory'].astype(str)),
+        }
+        last_good.put('filter_options', (), options)
+        return options
+
+    def refresh():
+        try:
+            return load()
+        except Exception:
+            last_good.retry('filter_options', (), load)
+            raise
+
+    entry = last_good.get('filter_options', ())
+    if not last_good.retrying('filter_options', ()):
+        futures = get_scheduler().submit({'filter_options': refresh})
+        if entry is None:
+            for _, options, error in get_scheduler().as_completed(futures, timeout=wait):
+                if error is None:
+                    return options
+    if entry is not None:
+        return entry[0]
+    default = queries.default_filters
+    return {'years': [default.year_from, default.year_to], 'categories': [], 'territories': []}
+
+
+# Sidebar filters of the AW charts
+def aw_filters(options):
+    default = queries.default_filters
+    low, high = options['years']
+    if low < high:
+        # The default years, clamped into the range dimtime actually covers
+        value = (min(max(low, default.year_from), high), max(min(high, default.year_to), low))
+        year_from, year_to = st.sidebar.slider("Order years", low, high, value)
+    else:
+        # A slider needs two distinct ends; there is only one year to pick
+        year_from = year_to = low
+        st.sidebar.caption(f"Order year: {low}")
+    category = st.sidebar.selectbox("Product category", ["All"] + options['categories'])
+    territory = st.sidebar.selectbox("Sales territory", ["All"] + options['territories'])
+    return queries.Filters(
+        year_from,
+        year_to,
+        None if category == "All" else category,
+        None if territory == "All" else territory,
     )
 
-    # Display pie chart using Streamlit
-    st.plotly_chart(fig)
-
-# Distribution
-def distributionimdb(data):
-    # Calculate rating distribution
-    rating_distribution = data['rating'].value_counts().sort_index()
-
-    # Create line chart without markers
-    fig = go.Figure(data=go.Scatter(x=rating_distribution.index, y=rating_distribution.values, 
-                                    mode='lines', line=dict(color='gold', width=2)))
-
-    fig.update_layout(
-        xaxis_title='Rating',
-        yaxis_title='Frequency',
-        xaxis=dict(color='white', gridcolor='rgba(255,255,255,0.2)', showgrid=True),
-        yaxis=dict(color='white', gridcolor='rgba(255,255,255,0.2)', showgrid=True),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=10, b=10),
-        font=dict(color='white', size=14),
+
+# Load the data and build the figure for every AW chart. Every figure built
+# is also kept as the chart's last known good result for these filters.
+def aw_tasks(db, figures, filters, last_good):
+    max_points = get_setting('relationship', 'max_points', 100000)
+    bins = get_setting('relationship', 'bins', 100)
+    use_rollups = get_setting('rollups', 'enabled', False)
+    series_points = get_setting('distribution', 'max_points', 250)
+
+    def task(name, query, figure):
+        def run():
+            fig = build_chart(name, query, figure, figures)
+            last_good.put(name, filters, fig, encode=figure_to_json)
+            return fig
+        return run
+
+    return {
+        'comparisonaw': task('comparisonaw', lambda: charts.query_comparisonaw(db, use_rollups, filters), charts.figure_comparisonaw),
+        'compositionaw': task('compositionaw', lambda: charts.query_compositionaw(db, use_rollups, filters), charts.figure_compositionaw),
+        'relationshipaw': task('relationshipaw', lambda: charts.query_relationshipaw(db, max_points, bins, filters), charts.figure_relationshipaw),
+        'distributionaw': task('distributionaw', lambda: charts.query_distributionaw(db, use_rollups, filters), lambda df: charts.figure_distributionaw(df, series_points)),
+    }
+
+
+# Metrics for the IMDB charts, computed in one pass over the dataset and
+# recomputed only when the file changes (see imdb_agg)
+def imdb_aggregates():
+    return load_aggregates(
+        get_setting('imdb', 'path', "dataset/imdbscrap.csv"),
+        max_in_memory_bytes=get_setting('imdb', 'max_in_memory_mb', 64) * 1024 * 1024,
+        chunksize=get_setting('imdb', 'chunksize', 100000),
+        processes=get_setting('imdb', 'processes', 0),
     )
 
-    # Display line chart using Streamlit
-    st.plotly_chart(fig)
 
+imdb_figures = {
+    'comparisonimdb': charts.figure_comparisonimdb,
+    'compositionimdb': charts.figure_compositionimdb,
+    'relationshipimdb': charts.figure_relationshipimdb,
+    'distributionimdb': charts.figure_distributionimdb,
+}
 
-# Function to perform text-to-speech
-def perform_tts(text, filename):
-    # Check if a file with the same name already exists
-    if os.path.exists(filename):
-        os.remove(filename)  # Remove the file if it already exists
 
-    # Create speech synthesis and save it to a file
-    tts = gTTS(text=text, lang='id')  # 'id' is for Indonesian language
-    tts.save(filename)
+# Draw an IMDB chart from the dataset aggregates
+def imdb_chart(target, name, figure):
+    render_chart(target, name, build_chart(name, imdb_aggregates, figure, get_figure_cache()))
 
-    # Display the audio player to play the saved audio file
-    st.audio(filename, format="audio/mp3")
+# Pre-rendered snapshot to serve instead of live data, if one is configured.
+# The published version is read on every rerun so a new build is picked up.
+def get_snapshot():
+    root = get_setting('snapshot', 'path', os.environ.get('DASHBOARD_SNAPSHOT'))
+    if not root:
+        return None
+    return open_snapshot(snapshot_directory(root))
+
+
+@st.cache_resource
+def open_snapshot(directory):
+    return Snapshot(directory)
+
+
+# Text-to-speech clip cache shared by every session; all explanations are
+# pre-generated in the background as soon as the server starts
+@st.cache_resource
+def get_tts():
+    tts = TTSCache(
+        make_synthesizer(get_setting('tts', 'backend', 'gtts')),
+        directory=get_setting('tts', 'directory', '.tts_cache'),
+        lang='id',  # 'id' is for Indonesian language
+    )
+    tts.pregenerate(explanations.values())
+    return tts
+
+# Function to perform text-to-speech
+def perform_tts(name):
+    snapshot = get_snapshot()
+    with tracing.chart(name), tracing.span('tts') as span:
+        audio = snapshot.audio(name) if snapshot else get_tts().get(explanations[name])
+        span.set(bytes=len(audio))
+
+    # Display the audio player straight from the cached MP3 bytes
+    st.audio(audio, format="audio/mp3")
+
+# Explanation and text-to-speech button of a chart. This is a fragment:
+# clicking the button reruns only this function, not the whole dashboard.
+@st.fragment
+def explanation(name):
+    st.write("Penjelasan:")
+    st.write(explanations[name])
+    if st.button(sections[name][2]):
+        perform_tts(name)
+
+# One dashboard section: title, chart slot, explanation and text-to-speech.
+# Returns the empty slot the chart is drawn into.
+def section(name):
+    title, subtitle, _ = sections[name]
+    st.markdown(f'<h3>{title}</h3>', unsafe_allow_html=True)
+    st.write(subtitle)
+    chart_slot = st.empty()
+    explanation(name)
+    return chart_slot
+
+# Sidebar panel with the spans of the current rerun, per chart
+def perf_panel(trace_run):
+    with st.sidebar.expander("Performance", expanded=True):
+        first_chart = tracing.first_chart()
+        if first_chart['last_ms'] is not None:
+            st.write("Time to first chart: {last_ms:.0f} ms (cold start {cold_ms:.0f} ms)".format(**first_chart))
+        if trace_run:
+            spans = pd.DataFrame(trace_run)
+            breakdown = spans.pivot_table(index='chart', columns='span', values='ms', aggfunc='sum')
+            st.write("This rerun (ms)")
+            st.dataframe(breakdown.round(1))
+        st.write("Recent reruns")
+        st.dataframe(pd.DataFrame(tracing.summary()))
 
 # Main Streamlit app
 def main():
@@ -332,88 +320,139 @@ def main():
         unsafe_allow_html=True,
     )
 
+    # Tracing: always on when configured, otherwise only while the panel is shown
+    show_perf_panel = st.sidebar.checkbox("Show performance panel")
+    if get_setting('trace', 'enabled', False):
+        tracing.enable_logging()
+    trace_run = tracing.start_run(show_perf_panel or get_setting('trace', 'enabled', False), started=script_started)
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        # Snapshot mode: everything comes from pre-rendered files, no database round-trips
+        st.sidebar.caption(f"Serving snapshot {snapshot.version}")
+    else:
+        # Cache controls: drop cached query results and show hit/miss counters
+        query_cache = get_query_cache()
+        if st.sidebar.button("Refresh data"):
+            query_cache.invalidate()
+        st.sidebar.caption("Query cache: {hits} hits, {misses} misses, {entries} entries".format(**query_cache.stats()))
+
+        # Seconds to wait for fresh AW results before showing the last known good ones
+        wait = get_setting('fallback', 'wait', 0.5)
+        last_good = get_last_good()
+        try:
+            pool, pool_error = get_pool(), None
+        except Exception as error:  # e.g. no [database] section in the secrets
+            pool, pool_error = None, error
+
+        filters, aw_futures = queries.default_filters, {}
+        if pool is not None:
+            # Pool metrics: connections in use, checkouts that had to wait, reconnects
+            st.sidebar.caption("DB pool: {in_use}/{size} in use, {waits} waits, {reconnects} reconnects, {statements} prepared statements".format(**pool.metrics()))
+
+            # Send the AW queries off before the page is laid out. Results are
+            # cached per set of filters; charts whose query is being retried in
+            # the background are not sent again until that succeeds.
+            db = charts.Database(pool, query_cache)
+            filters = aw_filters(aw_filter_options(db, last_good, wait))
+            tasks = aw_tasks(db, get_figure_cache(), filters, last_good)
+            aw_futures = get_scheduler().submit({
+                name: task for name, task in tasks.items() if not last_good.retrying(name, filters)
+            })
+
+    chart_slots = {}
+
     # Divide the screen into 2 columns
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown('<h3>Employee Count per Department</h3>', unsafe_allow_html=True)
-        st.write('Comparison - Column Chart Visualization')
-        comparisonaw(conn)
-        explanation1 = "Visualisasi ini menampilkan perbandingan jumlah karyawan (Employee Count) di setiap departemen. Jumlah karyawan dapat dilihat dari panjang batang pada grafik, di mana departemen dengan batang paling panjang memiliki jumlah karyawan terbanyak, sementara departemen dengan batang yang lebih pendek memiliki jumlah karyawan lebih sedikit. Analisis ini membantu dalam memahami distribusi tenaga kerja di berbagai departemen perusahaan. Terlihat bahwa jumlah karyawan terbanyak berada pada departemen Production, sedangkan jumlah karyawan paling sedikit berada pada departemen Executive. Jumlah karyawan yang besar di departemen Production berbanding lurus dengan fokus perusahaan yang bergerak di bidang produksi sepeda (Cycles). Sementara itu, departemen Executive adalah departemen dengan hierarki tertinggi di antara departemen lainnya, yang secara logis memiliki jumlah karyawan lebih sedikit karena semakin tinggi hierarki, jumlah karyawan cenderung semakin mengerucut atau sedikit."
-        st.write("Penjelasan:")
-        st.write(explanation1)
-        if st.button("Text to Speech Comparison AW"):
-            perform_tts(explanation1, "comparisonaw.mp3")
-
-        st.markdown('<h3>Reseller Place by Region</h3>', unsafe_allow_html=True)
-        st.write('Composition - Donut Chart Visualization')
-        compositionaw(conn)
-        explanation2 = "Visualisasi ini menampilkan proporsi jumlah reseller untuk setiap wilayah (Sales Territory Region). Setiap bagian pada grafik donat menunjukkan persentase jumlah reseller dalam wilayah tersebut terhadap total jumlah reseller di seluruh wilayah. Potongan donat yang lebih besar menunjukkan wilayah dengan lebih banyak reseller, sementara potongan donat yang lebih kecil menandakan wilayah dengan jumlah reseller yang lebih sedikit. Terlihat bahwa proporsi atau sebaran reseller di setiap wilayah tidak ada yang dominan atau condong pada satu wilayah saja. Proporsi reseller di setiap wilayah berkisar antara 5,71 persen hingga 18,7 persen. Hal ini menunjukkan distribusi yang relatif merata di antara berbagai wilayah."
-        st.write("Penjelasan:")
-        st.write(explanation2)
-        if st.button("Text to Speech Composition AW"):
-            perform_tts(explanation2, "compositionaw.mp3")
+        chart_slots['comparisonaw'] = section('comparisonaw')
+        chart_slots['compositionaw'] = section('compositionaw')
 
     with col2:
-        st.markdown('<h3>Scatter Plot of Sales Amount by Product Category</h3>', unsafe_allow_html=True)
-        st.write('Relationship - Scatter Plot Visualization')
-        relationshipaw(conn)
-        explanation3 = "Visualisasi ini menampilkan perbandingan jumlah penjualan (Sales Amount) untuk setiap kategori produk (Product Category). Sebaran data menunjukkan bagaimana penjualan terdistribusi di antara berbagai kategori produk, yang ditandai oleh ketebalan titik atau bulatan pada plot. Terlihat bahwa sebaran jumlah penjualan dari tiap kategori produk berbeda-beda. Pada kategori Bikes, sebaran jumlah penjualannya berada di kisaran 540 hingga 3578 USD. Pada kategori Clothing, sebaran jumlah penjualannya berada di kisaran 9 hingga 70 USD. Sedangkan pada kategori Accessories, sebaran jumlah penjualannya berada di kisaran 2 hingga 159 USD. Hal ini bisa terjadi karena perusahaan ini berfokus pada penjualan sepeda (Cycles), sehingga jumlah penjualan pada kategori produk Bikes lebih tinggi dibandingkan dengan kategori produk lainnya. Selain itu, kisaran harga Bikes lebih mahal daripada Clothing dan Accessories, yang juga mempengaruhi perbedaan jumlah penjualan di setiap kategori produk."
-        st.write("Penjelasan:")
-        st.write(explanation3)
-        if st.button("Text to Speech Relationship AW"):
-            perform_tts(explanation3, "relationshipaw.mp3")
-
-        st.markdown('<h3>Order Quantity Distribution by Month</h3>', unsafe_allow_html=True)
-        st.write('Distribution - Column Histogram Visualization')
-        distributionaw(conn)
-        explanation4 = "Visualisasi ini menampilkan distribusi jumlah pesanan (Order Quantity) berdasarkan bulan dari tahun 2001 hingga 2004. Setiap batang menunjukkan jumlah pesanan pada bulan tertentu, dengan sumbu x menunjukkan bulan dan sumbu y menunjukkan jumlah pesanan. Visualisasi ini membantu dalam melihat tren atau pola pesanan dari waktu ke waktu. Terlihat bahwa dari tahun 2001 hingga 2004, distribusi jumlah pesanan menunjukkan kestabilan selama dua tahun, dari Juli 2001 hingga Juni 2003. Kemudian, ada tren kenaikan yang signifikan mulai Juli 2003 dan seterusnya. Kenaikan jumlah pesanan yang drastis terlihat mulai dari bulan Juli 2003 hingga Juni 2004, di mana jumlah pesanan terus meningkat setiap bulannya."
-        st.write("Penjelasan:")
-        st.write(explanation4)
-        if st.button("Text to Speech Distribution AW"):
-            perform_tts(explanation4, "distributionaw.mp3")
+        chart_slots['relationshipaw'] = section('relationshipaw')
+        chart_slots['distributionaw'] = section('distributionaw')
 
     st.markdown("<h2 style='text-align: center; color: white;'>IMDB Top 250 Movies By Popularity</h2>", unsafe_allow_html=True)
 
     col3, col4 = st.columns(2)
 
     with col3:
-        st.markdown('<h3>Number of Movies by Their Label</h3>', unsafe_allow_html=True)
-        st.write('Comparison - Column Chart Visualization')
-        comparisonimdb(data)
-        explanation5 = "Visualisasi ini menampilkan jumlah film untuk setiap label. Setiap batang menunjukkan jumlah film dalam kategori tertentu, dengan sumbu x menunjukkan label dan sumbu y menunjukkan jumlah film. Visualisasi ini membantu dalam memahami distribusi film berdasarkan labelnya. Terlihat bahwa dalam daftar 250 film terpopuler, jumlah film terbanyak ada pada label R, sementara jumlah film tersedikit ada pada label NC-17. Hal ini bisa terjadi karena film berlabel R memiliki banyak peminat atau sangat populer di kalangan masyarakat. Terdapat 101 film berlabel R yang masuk dalam daftar 250 film terpopuler disebabkan oleh batasan usia yang yang tidak terlalu ketat, dimana penonton dibawah 17 tahun masih bisa menonton tapi harus didampingi oleh orangtua atau yang lebih dewasa. Di sisi lain, hanya ada satu film berlabel NC-17 yang masuk dalam daftar tersebut. Ini mungkin disebabkan oleh batasan usia yang ketat, di mana penonton di bawah 17 tahun dilarang menonton film berlabel NC-17, sehingga sulit mendapatkan pasar yang luas."
-        st.write("Penjelasan:")
-        st.write(explanation5)
-        if st.button("Text to Speech Comparison IMDB"):
-            perform_tts(explanation5, "comparisonimdb.mp3")
-
-        st.markdown('<h3>Proportion of Total Budget by Label</h3>', unsafe_allow_html=True)
-        st.write('Composition - Donut Chart Visualization')
-        compositionimdb(data)
-        explanation6 = "Visualisasi ini menampilkan proporsi total anggaran film yang dialokasikan untuk setiap label. Setiap bagian atau potongan pada diagram donat menunjukkan persentase dari total anggaran film yang dikelompokkan berdasarkan labelnya. Terlihat bahwa proporsi total anggaran film yang dialokasikan untuk setiap label berbeda-beda, berkisar antara 0,0000102 persen hingga 36,2 persen. Proporsi anggaran yang besar diperuntukkan untuk pembuatan film dengan label PG-13 dan R, masing-masing sebesar 36,2 persen untuk label PG-13 dan 35,5 persen untuk label R. Hal ini disebabkan oleh tingginya minat pasar terhadap film dengan rating tersebut, sehingga banyak film dengan label PG-13 dan R dibuat dengan anggaran yang besar. Di sisi lain, sedikit anggaran untuk film dengan label Passed, NC-17, dan Approved, masing-masing hanya 0,0000102 persen untuk label Passed, 0,0459 persen untuk label NC-17, dan 0,373 persen untuk label Approved. Hal ini disebabkan oleh sedikitnya film dengan label tersebut yang masuk dalam daftar TOP 250 Movies terpopuler dan kurangnya pasar yang besar untuk jenis film ini."
-        st.write("Penjelasan:")
-        st.write(explanation6)
-        if st.button("Text to Speech Composition IMDB"):
-            perform_tts(explanation6, "compositionimdb.mp3")
+        chart_slots['comparisonimdb'] = section('comparisonimdb')
+        chart_slots['compositionimdb'] = section('compositionimdb')
 
     with col4:
-        st.markdown('<h3>Scatter Plot of Release Year and Rating</h3>', unsafe_allow_html=True)
-        st.write('Relationship - Scatter Plot Visualization')
-        relationshipimdb(data)
-        explanation7 = "Visualisasi ini menampilkan hubungan antara tahun rilis dan rating film. Setiap titik pada plot menunjukkan rating film pada tahun tertentu. Visualisasi ini membantu dalam memahami tren perubahan rating film seiring waktu dan trafik kepadatan di tiap jangka waktu. Terlihat bahwa trafik atau aktivitas terpadat terjadi pada film-film yang dirilis antara tahun 1990-an hingga 2010-an. Hal ini disebabkan oleh tingkat kepopuleran tinggi dari film-film yang dirilis dalam periode tersebut. Masyarakat kemungkinan besar akrab dengan atau pernah menonton film-film yang rilis pada tahun-tahun tersebut. Selain itu, pasar film global pada periode ini sangat luas dan diminati oleh banyak orang. Yang dimana industri film mengalami ledakan popularitas global dengan kemunculan film-film blockbuster yang memikat perhatian publik secara luas. Ini juga merupakan masa di mana teknologi digital dan internet mulai memengaruhi cara film diproduksi, didistribusikan, dan dikonsumsi oleh penonton di seluruh dunia."
-        st.write("Penjelasan:")
-        st.write(explanation7)
-        if st.button("Text to Speech Relationship IMDB"):
-            perform_tts(explanation7, "relationshipimdb.mp3")
-
-        st.markdown('<h3>Film Ratings Distribution Histogram</h3>', unsafe_allow_html=True)
-        st.write('Distribution - Line Histogram Visualization')
-        distributionimdb(data)
-        explanation8 = "Visualisasi ini menampilkan distribusi rating film dalam bentuk histogram garis. Sumbu x menunjukkan rating film, sementara sumbu y menunjukkan frekuensi kemunculan rating tersebut. Visualisasi ini membantu dalam memahami sebaran rating film secara keseluruhan dan menemukan tren atau pola dari rating film. Terlihat bahwa film-film yang masuk dalam TOP 250 Movies terpopuler memiliki rating antara 8 hingga 9,2. Rating yang paling banyak ditemui adalah 8,1, dengan jumlah 71 film. Untuk rating di atas 8,1, jumlah film secara bertahap menurun. Hal ini menunjukkan bahwa film-film dengan rating tinggi cenderung mendominasi dalam daftar TOP 250 Movies terpopuler. Namun, perlu dicatat bahwa rating film tidak selalu mencerminkan jumlah orang yang memberikan ulasan. Sebagai contoh, sebuah film dengan rating 8,5 mungkin hanya didasarkan pada sedikit ulasan yang memberikan nilai tinggi, sementara film dengan rating 7,5 bisa jadi memiliki lebih banyak ulasan yang memberikan skor lebih rendah. Oleh karena itu, rating tinggi tidak selalu menjamin bahwa film tersebut populer secara luas oleh masyarakat atau memiliki banyak penggemar."
-        st.write("Penjelasan:")
-        st.write(explanation8)
-        if st.button("Text to Speech Distribution IMDB"):
-            perform_tts(explanation8, "distributionimdb.mp3")
+        chart_slots['relationshipimdb'] = section('relationshipimdb')
+        chart_slots['distributionimdb'] = section('distributionimdb')
+
+    if snapshot is not None:
+        for name, slot in chart_slots.items():
+            render_chart(slot, name, snapshot.figure(name))
+    else:
+        # The IMDB charts only need the local dataset and are drawn right away
+        for name, figure in imdb_figures.items():
+            imdb_chart(chart_slots[name], name, figure)
+
+        # Start pre-generating the text-to-speech clips
+        get_tts()
+
+        def last_good_figure(name):
+            return last_good.get(name, filters, decode=figure_from_json)
+
+        # Caption placeholder and saved time of every chart showing its last
+        # known good figure, which is drawn at most once per rerun
+        stale = {}
+
+        def show_stale(name, message):
+            if name in stale:
+                caption, saved = stale[name]
+                caption.caption(stale_caption(message, saved))
+                return True
+            entry = last_good_figure(name)
+            if entry is None:
+                return False
+            stale[name] = (render_stale(chart_slots[name], name, entry, message), entry[1])
+            return True
+
+        # Keep the last known good figure up and retry in the background
+        def failed(name, error):
+            if pool is not None:
+                last_good.retry(name, filters, tasks[name])
+            if not show_stale(name, f"Could not refresh this chart ({error})."):
+                chart_slots[name].error(f"Could not load this chart: {error}")
+
+        submitted = set(aw_futures.values())
+        for name in aw_charts:
+            if name not in submitted:
+                failed(name, pool_error or "the database did not answer, retrying in the background")
+
+        # AW charts whose result is ready by now are drawn fresh, the others
+        # show their last known good figure until their own result arrives
+        scheduler = get_scheduler()
+        late = set()
+        for name, fig, error in scheduler.as_completed(aw_futures, timeout=wait):
+            if error is None:
+                render_chart(chart_slots[name], name, fig)
+            elif isinstance(error, TimeoutError):
+                late.add(name)
+                show_stale(name, "Refreshing...")
+            else:
+                failed(name, error)
+
+        # Fill in the late ones in completion order; a slow query only leaves its own chart pending
+        late_futures = {future: name for future, name in aw_futures.items() if name in late}
+        for name, fig, error in scheduler.as_completed(late_futures, timeout=get_setting('pool', 'query_timeout', 30)):
+            if error is None:
+                render_chart(chart_slots[name], name, fig)
+            elif isinstance(error, TimeoutError):
+                if name not in stale:
+                    chart_slots[name].info("This chart is still loading, refresh the page to see it.")
+            else:
+                failed(name, error)
+
+    # Timing breakdown of this rerun and p50/p95 over recent reruns
+    if show_perf_panel:
+        perf_panel(trace_run)
 
 # Run the app
 if __name__ == "__main__":
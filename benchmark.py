@@ -0,0 +1,319 @@
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import charts
+import queries
+import tracing
+from imdb_agg import aggregate_file
+
+# Rows in factinternetsales at scale 1, as in the stock AdventureWorks database
+base_sales_rows = 60398
+
+departments = {
+    'Production': 179, 'Sales': 18, 'Purchasing': 12, 'Information Services': 10,
+    'Finance': 11, 'Marketing': 10, 'Engineering': 6, 'Facilities and Maintenance': 7,
+    'Shipping and Receiving': 6, 'Human Resources': 6, 'Production Control': 6,
+    'Quality Assurance': 6, 'Document Control': 5, 'Research and Development': 4,
+    'Tool Design': 4, 'Executive': 2,
+}
+
+# Category name, number of subcategories and the range of its sales amounts
+categories = [
+    ('Bikes', 3, 540.0, 3578.0),
+    ('Components', 14, 20.0, 1400.0),
+    ('Clothing', 8, 9.0, 70.0),
+    ('Accessories', 12, 2.0, 159.0),
+]
+
+# Sales territory regions and the group each belongs to
+regions = {
+    'Northwest': 'North America', 'Northeast': 'North America', 'Central': 'North America',
+    'Southwest': 'North America', 'Southeast': 'North America', 'Canada': 'North America',
+    'France': 'Europe', 'Germany': 'Europe', 'United Kingdom': 'Europe', 'Australia': 'Pacific',
+}
+
+
+# Minimal stand-in for ConnectionPool over a local SQLite file. Queries keep
+# the MySQL "%s" placeholders of the dashboard and are translated here.
+class SQLitePool:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.create_function('FLOOR', 1, math.floor)
+
+    @contextmanager
+    def cursor(self):
+        cursor = _SQLiteCursor(self.conn.cursor())
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    # sqlite3 keeps its own cache of compiled statements, so a prepared
+    # statement is just a cursor here
+    def statement(self, query):
+        return self.cursor()
+
+    def close(self):
+        self.conn.close()
+
+
+class _SQLiteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None):
+        return self._cursor.execute(query.replace('%s', '?'), params or ())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+# Create the tables the dashboard queries, with factinternetsales scaled by `scale`
+def generate_adventureworks(path, scale, seed=0):
+    if os.path.exists(path):
+        os.remove(path)
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE dimemployee (EmployeeKey INTEGER PRIMARY KEY, DepartmentName TEXT);
+        CREATE TABLE dimproductcategory (ProductCategoryKey INTEGER PRIMARY KEY, EnglishProductCategoryName TEXT);
+        CREATE TABLE dimproductsubcategory (ProductSubcategoryKey INTEGER PRIMARY KEY, ProductCategoryKey INTEGER);
+        CREATE TABLE dimproduct (ProductKey INTEGER PRIMARY KEY, ProductSubcategoryKey INTEGER, ListPrice REAL);
+        CREATE TABLE dimtime (TimeKey INTEGER PRIMARY KEY, FullDateAlternateKey TEXT, EnglishMonthName TEXT,
+                              WeekNumberOfYear INTEGER, MonthNumberOfYear INTEGER, CalendarQuarter INTEGER,
+                              CalendarYear INTEGER);
+        CREATE TABLE dimsalesterritory (SalesTerritoryKey INTEGER PRIMARY KEY, SalesTerritoryRegion TEXT, SalesTerritoryGroup TEXT);
+        CREATE TABLE dimgeography (GeographyKey INTEGER PRIMARY KEY, SalesTerritoryKey INTEGER);
+        CREATE TABLE dimreseller (ResellerKey INTEGER PRIMARY KEY, GeographyKey INTEGER);
+        CREATE TABLE factinternetsales (ProductKey INTEGER, OrderDateKey INTEGER, SalesTerritoryKey INTEGER,
+                                        OrderQuantity INTEGER, SalesAmount REAL);
+    """)
+
+    employees = [(i, name) for i, name in enumerate(
+        (name for name, count in departments.items() for _ in range(count)), start=1)]
+    conn.executemany("INSERT INTO dimemployee VALUES (?, ?)", employees)
+
+    subcategories, products = [], []
+    for category_key, (name, subcategory_count, low, high) in enumerate(categories, start=1):
+        conn.execute("INSERT INTO dimproductcategory VALUES (?, ?)", (category_key, name))
+        for _ in range(subcategory_count):
+            subcategory_key = len(subcategories) + 1
+            subcategories.append((subcategory_key, category_key))
+            for price in rng.uniform(low, high, size=12).round(2):
+                products.append((len(products) + 1, subcategory_key, float(price)))
+    conn.executemany("INSERT INTO dimproductsubcategory VALUES (?, ?)", subcategories)
+    conn.executemany("INSERT INTO dimproduct VALUES (?, ?, ?)", products)
+
+    days = pd.date_range('2001-07-01', '2004-07-31', freq='D')
+    # Weeks start on Sunday and week 1 is the one containing January 1st
+    conn.executemany("INSERT INTO dimtime VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (i, day.strftime('%Y-%m-%d'), day.strftime('%B'),
+         (day.dayofyear - 1 + (day.replace(month=1, day=1).weekday() + 1) % 7) // 7 + 1,
+         day.month, day.quarter, day.year)
+        for i, day in enumerate(days, start=1)
+    ])
+
+    conn.executemany("INSERT INTO dimsalesterritory VALUES (?, ?, ?)", [
+        (i, region, group) for i, (region, group) in enumerate(regions.items(), start=1)
+    ])
+    geographies = [(i, int(rng.integers(1, len(regions) + 1))) for i in range(1, 656)]
+    conn.executemany("INSERT INTO dimgeography VALUES (?, ?)", geographies)
+    resellers = [(i, int(rng.integers(1, len(geographies) + 1))) for i in range(1, 702)]
+    conn.executemany("INSERT INTO dimreseller VALUES (?, ?)", resellers)
+
+    # Sales triple from July 2003 on, like the real data set
+    weights = np.where(days >= pd.Timestamp('2003-07-01'), 3.0, 1.0)
+    weights /= weights.sum()
+    prices = np.array([price for _, _, price in products])
+    total = base_sales_rows * scale
+    for start in range(0, total, 500000):
+        n = min(500000, total - start)
+        product_index = rng.integers(0, len(products), size=n)
+        quantity = np.ones(n, dtype=np.int64)
+        conn.executemany("INSERT INTO factinternetsales VALUES (?, ?, ?, ?, ?)", zip(
+            (product_index + 1).tolist(),
+            (rng.choice(len(days), size=n, p=weights) + 1).tolist(),
+            rng.integers(1, len(regions) + 1, size=n).tolist(),
+            quantity.tolist(),
+            (prices[product_index] * quantity).round(2).tolist(),
+        ))
+    for statement in queries.index_advice.values():
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+# Write the IMDB CSV repeated `scale` times, with release years and ratings jittered
+def generate_imdb(source, path, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.read_csv(source, sep=";")
+    frames = []
+    for copy in range(scale):
+        frame = data.copy()
+        if copy:
+            frame['name'] = frame['name'] + f" ({copy})"
+            frame['release_year'] = frame['release_year'] + rng.integers(-3, 4, size=len(frame))
+            frame['rating'] = (frame['rating'] + rng.integers(-2, 3, size=len(frame))).clip(10, 100)
+        frames.append(frame)
+    pd.concat(frames).to_csv(path, sep=";", index=False)
+
+
+# Run `build` (returning a figure, its stage timings and row count) and time
+# the figure serialization, then rerun it under tracemalloc to get the peak
+# memory without slowing down the timed runs
+def measure(build, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fig, timings, rows = build()
+        built = time.perf_counter()
+        payload = fig.to_json()
+        serialized = time.perf_counter()
+        runs.append(dict(timings, serialize=serialized - built, total=serialized - started))
+
+    tracemalloc.start()
+    fig, _, _ = build()
+    fig.to_json()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {stage: round(statistics.median(run[stage] for run in runs), 6) for stage in runs[0]}
+    result.update(rows=rows, peak_bytes=peak, figure_bytes=len(payload.encode('utf-8')))
+    return result
+
+
+# The query, fetch and frame stages are taken from the tracing spans that
+# charts.Database records, so the benchmark times the dashboard's own code path
+def aw_builder(pool, query, figure):
+    def build():
+        run = tracing.start_run()
+        df = query(charts.Database(pool))
+        started = time.perf_counter()
+        fig = figure(df)
+        timings = {'query': 0.0, 'fetch': 0.0, 'frame': 0.0, 'figure': time.perf_counter() - started}
+        rows = 0
+        for span in run:
+            timings[span['span']] += span['ms'] / 1000
+            if span['span'] == 'fetch':
+                rows += span['rows']
+        tracing.start_run(False)
+        return fig, timings, rows
+    return build
+
+
+def imdb_builder(path, figure):
+    def build():
+        started = time.perf_counter()
+        aggregates = aggregate_file(path)
+        loaded = time.perf_counter()
+        fig = figure(aggregates)
+        timings = {'frame': loaded - started, 'figure': time.perf_counter() - loaded}
+        return fig, timings, aggregates.rows
+    return build
+
+
+# Code run in a fresh interpreter to time a cold start: importing the
+# dashboard modules the way app.py does and building the first IMDB figure
+first_chart_script = """
+import sys, time
+started = time.perf_counter()
+import charts, db_pool, imdb_agg, last_good, queries, snapshot, tts
+imported = time.perf_counter()
+charts.figure_comparisonimdb(imdb_agg.aggregate_file(sys.argv[1])).to_json()
+print(imported - started, time.perf_counter() - started)
+"""
+
+
+# Median import and time to first chart over `repeat` fresh interpreters
+def measure_first_chart(imdb_path, repeat):
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', first_chart_script, imdb_path],
+                                check=True, capture_output=True, text=True).stdout
+        runs.append([float(value) for value in output.split()])
+    return {
+        'imports': round(statistics.median(run[0] for run in runs), 6),
+        'first_chart': round(statistics.median(run[1] for run in runs), 6),
+    }
+
+
+def run(scales, repeat, workdir, imdb_source, seed):
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    for scale in scales:
+        db_path = os.path.join(workdir, f"adventureworks_x{scale}.sqlite")
+        csv_path = os.path.join(workdir, f"imdbscrap_x{scale}.csv")
+        generate_adventureworks(db_path, scale, seed)
+        generate_imdb(imdb_source, csv_path, scale, seed)
+
+        pool = SQLitePool(db_path)
+        builders = {
+            'comparisonaw': aw_builder(pool, charts.query_comparisonaw, charts.figure_comparisonaw),
+            'relationshipaw': aw_builder(pool, charts.query_relationshipaw, charts.figure_relationshipaw),
+            'compositionaw': aw_builder(pool, charts.query_compositionaw, charts.figure_compositionaw),
+            'distributionaw': aw_builder(pool, charts.query_distributionaw, charts.figure_distributionaw),
+            # One year of daily buckets, downsampled to the point budget
+            'distributionaw_day': aw_builder(pool, lambda db: charts.query_distributionaw(db, filters=queries.Filters(2003, 2003, None, None)), charts.figure_distributionaw),
+            'comparisonimdb': imdb_builder(csv_path, charts.figure_comparisonimdb),
+            'relationshipimdb': imdb_builder(csv_path, charts.figure_relationshipimdb),
+            'compositionimdb': imdb_builder(csv_path, charts.figure_compositionimdb),
+            'distributionimdb': imdb_builder(csv_path, charts.figure_distributionimdb),
+        }
+        try:
+            for chart, build in builders.items():
+                result = dict(scale=scale, chart=chart, **measure(build, repeat))
+                results.append(result)
+                print(f"x{scale:<4} {chart:<18} {result['total'] * 1000:9.1f} ms  {result['peak_bytes'] / 1e6:8.1f} MB peak  {result['figure_bytes'] / 1e3:9.1f} kB figure")
+        finally:
+            pool.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard chart against generated data")
+    parser.add_argument('--scales', default='1,10', help="comma separated factinternetsales scale factors, e.g. 1,10,100")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per chart, the median is reported")
+    parser.add_argument('--workdir', default='.bench', help="where the generated databases and CSVs are written")
+    parser.add_argument('--imdb', default='dataset/imdbscrap.csv', help="IMDB CSV to scale up")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON report, by default benchmark_results.json in the workdir")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    results = run(scales, args.repeat, args.workdir, args.imdb, args.seed)
+    first_chart = measure_first_chart(args.imdb, args.repeat)
+    print(f"cold start: imports {first_chart['imports'] * 1000:.1f} ms, first chart {first_chart['first_chart'] * 1000:.1f} ms")
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+        'cold_start': first_chart,
+    }
+    output = args.output or os.path.join(args.workdir, 'benchmark_results.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import threading
+
+import pandas as pd
+
+import queries
+import tracing
+from downsample import lttb
+from fetch import chunk_rows, concat_chunks, iter_columns
+
+# plotly is imported inside the figure functions: it is the slowest import of
+# the app and not needed until the first figure is built
+
+
+class Database:
+    # Runs dashboard queries on a connection pool, through an optional
+    # shared result cache, and returns each result as a DataFrame
+    def __init__(self, pool, cache=None, chunk_size=10000):
+        self.pool = pool
+        self.cache = cache
+        self.chunk_size = chunk_size
+
+    # With prepared=True the query runs as a server-side prepared statement
+    # kept on the pooled connection (see ConnectionPool.statement)
+    def query(self, query, params=None, prepared=False):
+        if self.cache is None:
+            return self._load(query, params, prepared)
+        return self.cache.get_or_load(query, params, lambda: self._load(query, params, prepared))
+
+    # Rows are streamed in bounded chunks straight into typed columns
+    # (see fetch.py) instead of being materialized as a list of tuples: only
+    # one chunk of tuples is alive, the typed chunks add up to about the size
+    # of the result and are released column by column as the frame is built
+    def _load(self, query, params, prepared=False):
+        with (self.pool.statement(query) if prepared else self.pool.cursor()) as cursor:
+            with tracing.span('query'):
+                cursor.execute(query, params)
+            columns = [desc[0] for desc in cursor.description]
+            with tracing.span('fetch') as span:
+                chunks = list(iter_columns(cursor, self.chunk_size))
+                span.set(rows=sum(chunk_rows(chunk) for chunk in chunks))
+            with tracing.span('frame') as span:
+                df = concat_chunks(chunks, columns)
+                if span.enabled:
+                    span.set(rows=len(df), bytes=int(df.memory_usage(deep=True).sum()))
+            return df
+
+
+class FigureCache:
+    # Last figure built for each chart, reused for as long as the chart's
+    # source (its cached result frame or IMDB aggregates) is the same object
+    def __init__(self):
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, name, source, build):
+        with self._lock:
+            entry = self._figures.get(name)
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        fig = build()
+        with self._lock:
+            self._figures[name] = (source, fig)
+        return fig
+
+
+# Comparison
+def query_comparisonaw(db, use_rollups=False, filters=None):
+    # Employees are not filtered by year, category or territory
+    return queries.run(db, 'comparisonaw_rollup' if use_rollups else 'comparisonaw', filters)
+
+def figure_comparisonaw(df):
+    import plotly.express as px
+
+    # Fill missing values with 0 (on a copy, the cached result is shared)
+    df = df.fillna({'employee_count': 0})
+    
+    fig = px.bar(df, y='DepartmentName', x='employee_count', 
+                 labels={'DepartmentName': 'Department Name', 'employee_count': 'Employee Count'}, 
+                 color_discrete_sequence=['gold'])
+
+    fig.update_layout(
+        yaxis_title='Department Name',
+        xaxis_title='Employee Count',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(color='white', size=14),
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+    )
+
+    return fig
+
+# Relationship
+def query_relationshipaw(db, max_points=100000, bins=100, filters=None):
+    # Row count and value range per category, so we know how much data there is
+    stats = queries.run(db, 'relationshipaw_stats', filters)
+
+    if stats['sales_count'].sum() <= max_points:
+        # Small table: one marker per sale
+        return queries.run(db, 'relationshipaw', filters)
+
+    # Large table: bin sales amounts per category in SQL, so the payload is
+    # bounded by categories x bins instead of growing with the fact table.
+    # The cached frame is returned as is (fetch already types the columns
+    # as float64/int64), so the figure cache can reuse its figure.
+    return queries.run(db, 'relationshipaw_binned', filters, bins=bins)
+
+def figure_relationshipaw(df):
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    if 'sales_count' not in df:
+        # Create a scatter plot
+        fig = px.scatter(df, x='category', y='SalesAmount', 
+                         labels={'category': 'Product Category', 'SalesAmount': 'Sales Amount'},
+                         color_discrete_sequence=['gold'],
+                         opacity=0.75,
+                         render_mode='webgl')
+    else:
+        # Density strip: one WebGL marker per bin, sized by how many sales fall in it
+        sizes = 4 + 16 * (df['sales_count'] / df['sales_count'].max()) ** 0.5
+        fig = go.Figure(data=[go.Scattergl(
+            x=df['category'],
+            y=df['SalesAmount'],
+            mode='markers',
+            marker=dict(color='gold', size=sizes, opacity=0.75),
+            customdata=df[['bin_low', 'bin_high', 'sales_count']],
+            hovertemplate='%{x}<br>US$ %{customdata[0]:,.2f} - %{customdata[1]:,.2f}<br>%{customdata[2]:,} sales<extra></extra>',
+        )])
+
+    fig.update_layout(
+        xaxis_title='Product Category',
+        yaxis_title='Sales Amount (US$)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(color='white', size=14),
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)', tickmode='array', tickvals=list(df['category'].unique())),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+    )
+
+    return fig
+
+# Composition
+def query_compositionaw(db, use_rollups=False, filters=None):
+    # The rollup only holds the unfiltered counts
+    filters = filters or queries.default_filters
+    if use_rollups and filters.territory is None:
+        return queries.run(db, 'compositionaw_rollup', filters)
+    return queries.run(db, 'compositionaw', filters)
+
+def figure_compositionaw(df):
+    import plotly.express as px
+
+    # Plotting the pie chart
+    fig = px.pie(df, values='reseller_count', names='region',
+                 hole=0.5,
+                 color_discrete_sequence=['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d', '#ffefa1', '#fff2b5'])
+
+    fig.update_traces(textinfo='percent+label', pull=0.05)
+    fig.update_layout(
+        font=dict(color='white', size=12),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+    return fig
+
+# Distribution
+# Time bucket of the order quantity series by the number of years selected:
+# the longer the range, the coarser the bucket (quarters beyond the last entry)
+distribution_granularities = [(1, 'day'), (3, 'week'), (15, 'month')]
+
+# x axis title and date format per bucket
+period_axes = {
+    'day': ('Day', '%d %b %Y'),
+    'week': ('Week', '%d %b %Y'),
+    'month': ('Month', '%b %Y'),
+    'quarter': ('Quarter', 'Q%q %Y'),
+}
+
+def distribution_granularity(filters):
+    years = filters.year_to - filters.year_from + 1
+    for max_years, granularity in distribution_granularities:
+        if years <= max_years:
+            return granularity
+    return 'quarter'
+
+def query_distributionaw(db, use_rollups=False, filters=None):
+    filters = filters or queries.default_filters
+    granularity = distribution_granularity(filters)
+    if use_rollups and granularity == 'month' and filters.category is None and filters.territory is None:
+        # Pre-aggregated per month by rollups.py, cost does not grow with the fact table.
+        # It has no category or territory breakdown, so those filters read the base tables.
+        return queries.run(db, 'distributionaw_rollup', filters)
+    return queries.run(db, f'distributionaw_{granularity}', filters)
+
+def figure_distributionaw(df, max_points=250):
+    import plotly.graph_objects as go
+
+    # Start date of each period; rollup rows only carry the year and month
+    if 'period' in df:
+        period = pd.to_datetime(df['period'].astype(str))
+    else:
+        period = pd.to_datetime(pd.DataFrame({'year': df['CalendarYear'], 'month': df['MonthNumberOfYear'], 'day': 1}))
+    quantity = df['OrderQuantity'].to_numpy(dtype=float)
+    granularity = str(df['granularity'].iloc[0]) if len(df) else 'month'
+    axis_title, date_format = period_axes[granularity]
+
+    # Series longer than max_points are downsampled server-side, so the
+    # figure payload stays about the same however much history is selected
+    kept = lttb(period.to_numpy(dtype='datetime64[ns]').astype('int64'), quantity, max_points)
+    if len(kept) < len(df):
+        trace = go.Scatter(
+            x=period.iloc[kept],
+            y=quantity[kept],
+            mode='lines',
+            fill='tozeroy',
+            line=dict(color='gold', width=2),
+        )
+    else:
+        trace = go.Bar(
+            x=period,
+            y=quantity,
+            marker_color='gold'
+        )
+    fig = go.Figure(data=[trace])
+
+    fig.update_layout(
+        xaxis_title=axis_title,
+        yaxis_title='Order Quantity',
+        xaxis=dict(
+            type='date',
+            tickangle=-45,
+            tickformat=date_format,
+            hoverformat=date_format,
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(
+            color='white',
+            size=12,
+            weight='bold'
+        )
+    )
+
+    return fig
+
+
+# Comparison
+def figure_comparisonimdb(agg):
+    import plotly.express as px
+
+    # Number of movies for each label, from the aggregates (see imdb_agg)
+    count_by_label = agg.count_by_label()
+
+    # Set palette colors
+    colors = ['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d', '#ffefa1', '#fff2b5']
+
+    # Create the bar chart using Plotly
+    fig = px.bar(count_by_label, x='label', y='count', 
+                 labels={'label': 'Label', 'count': 'Number of Movies'},
+                 color='label', color_discrete_sequence=colors)
+
+    fig.update_layout(
+        xaxis=dict(title='Label', color='white', tickfont=dict(color='white')),
+        yaxis=dict(title='Number of Movies', color='white', tickfont=dict(color='white')),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(color='white', size=12),
+    )
+
+    return fig
+
+# Relationship
+def figure_relationshipimdb(agg):
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    points = agg.points
+    if points is not None:
+        # Create scatter plot
+        fig = px.scatter(points, x='release_year', y='rating', 
+                         labels={'release_year': 'Release Year', 'rating': 'Rating'},
+                         color_discrete_sequence=['gold'],
+                         opacity=0.5)
+    else:
+        # Too many movies for one marker each: one marker per (year, rating) bin, sized by count
+        bins = agg.year_rating()
+        sizes = 4 + 16 * (bins['count'] / bins['count'].max()) ** 0.5
+        fig = go.Figure(data=[go.Scattergl(
+            x=bins['release_year'],
+            y=bins['rating'],
+            mode='markers',
+            marker=dict(color='gold', size=sizes, opacity=0.5),
+            customdata=bins['count'],
+            hovertemplate='%{x}, rating %{y}<br>%{customdata:,} movies<extra></extra>',
+        )])
+
+    fig.update_layout(
+        xaxis_title='Release Year',
+        yaxis_title='Rating',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(color='white', size=14),
+        xaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.2)'),
+    )
+
+    return fig
+
+# Composition
+def figure_compositionimdb(agg):
+    import plotly.graph_objects as go
+
+    # Total budget for each label
+    total_budget_by_label = agg.budget_by_label()
+
+    # Total budget overall
+    total_budget_all = agg.budget_total
+
+    # Calculate proportions for each label
+    proportions = total_budget_by_label / total_budget_all
+
+    # Sort proportions from largest to smallest
+    proportions_sorted = proportions.sort_values(ascending=False)
+
+    # Set palette colors
+    colors = ['#ffd404', '#ffd718', '#ffdb2b', '#ffde3f', '#ffe152', '#ffe566', '#ffe87a', '#ffec8d']
+
+    # Create pie chart
+    fig = go.Figure(data=[go.Pie(
+        labels=proportions_sorted.index.astype(str),
+        values=proportions_sorted.values,
+        hole=0.5,
+        textinfo='percent+label',
+        marker=dict(colors=colors),
+    )])
+
+    fig.update_layout(
+        font=dict(color='white', size=12),
+        margin=dict(t=10, b=10),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+
+    return fig
+
+# Distribution
+def figure_distributionimdb(agg):
+    import plotly.graph_objects as go
+
+    # Rating distribution
+    rating_distribution = agg.rating_distribution()
+
+    # Create line chart without markers
+    fig = go.Figure(data=go.Scatter(x=rating_distribution.index, y=rating_distribution.values, 
+                                    mode='lines', line=dict(color='gold', width=2)))
+
+    fig.update_layout(
+        xaxis_title='Rating',
+        yaxis_title='Frequency',
+        xaxis=dict(color='white', gridcolor='rgba(255,255,255,0.2)', showgrid=True),
+        yaxis=dict(color='white', gridcolor='rgba(255,255,255,0.2)', showgrid=True),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, b=10),
+        font=dict(color='white', size=14),
+    )
+
+    return fig
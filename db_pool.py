@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+import tomllib
+import weakref
+from contextlib import contextmanager
+
+
+# The MySQL driver is imported on the first connection, not with the module,
+# so starting the app does not pay for it before anything is drawn
+def _driver():
+    import mysql.connector
+    return mysql.connector
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    # Thread-safe pool of MySQL connections shared by every session.
+    # Connections are opened lazily up to `size`, pinged on checkout and
+    # reconnected when the server has dropped them.
+    def __init__(self, size=5, checkout_timeout=10, query_timeout=30, connect_timeout=5, **connect_args):
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.query_timeout = query_timeout
+        self.connect_timeout = connect_timeout
+        self.connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._reconnects = 0
+        # Prepared statements per open connection, by SQL text. Weak keys, so
+        # an entry never outlives its connection nor is inherited by a new
+        # connection that happens to reuse the address of a dropped one.
+        self._statements = weakref.WeakKeyDictionary()
+
+    def _connect(self):
+        conn = _driver().connect(
+            connection_timeout=self.connect_timeout,
+            autocommit=True,  # otherwise a pooled connection keeps reading one stale snapshot
+            **self.connect_args
+        )
+        self._apply_timeout(conn)
+        return conn
+
+    # Limit how long the server lets a SELECT run on this connection (0 = no limit)
+    def _apply_timeout(self, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int(self.query_timeout * 1000),))
+        finally:
+            cursor.close()
+
+    # Make sure a connection is still alive, reconnecting it if needed
+    def _check(self, conn):
+        try:
+            conn.ping(reconnect=False)
+        except _driver().Error:
+            conn.reconnect(attempts=3, delay=1)
+            self._apply_timeout(conn)
+            # Server-side statements do not survive the reconnect
+            with self._lock:
+                self._statements.pop(conn, None)
+                self._reconnects += 1
+
+    def _acquire(self):
+        with self._lock:
+            self._checkouts += 1
+        conn, opening, waited = None, False, False
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        while conn is None and not opening:
+            try:
+                conn = self._idle.get_nowait() if not waited else self._idle.get(timeout=0.1)
+                continue
+            except queue.Empty:
+                pass
+            with self._lock:
+                # A slot is free when the pool is not full yet or a broken connection was dropped
+                if self._opened < self.size:
+                    self._opened += 1
+                    opening = True
+                elif not waited:
+                    waited = True
+                    self._waits += 1
+            if not opening and time.monotonic() > deadline:
+                raise PoolTimeout(f"No database connection available after {self.checkout_timeout}s")
+        if waited:
+            with self._lock:
+                self._wait_time += time.monotonic() - started
+
+        try:
+            if opening:
+                conn = self._connect()
+            else:
+                self._check(conn)
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+                if conn is not None:
+                    self._statements.pop(conn, None)
+            raise
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def _release(self, conn, broken=False):
+        with self._lock:
+            self._in_use -= 1
+            if broken:
+                self._opened -= 1
+                self._statements.pop(conn, None)
+        if broken:
+            try:
+                conn.close()
+            except _driver().Error:
+                pass
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            # Connection state is unknown after a failure, so do not reuse it
+            self._release(conn, broken=True)
+            raise
+        else:
+            self._release(conn)
+
+    # Check out a connection and yield a cursor that is always closed
+    @contextmanager
+    def cursor(self, **kwargs):
+        with self.connection() as conn:
+            cursor = conn.cursor(**kwargs)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    # Check out a connection and yield a cursor holding `query` as a
+    # server-side prepared statement. The cursor stays open with its pooled
+    # connection, so the statement is parsed once per connection and later
+    # executions only send the parameters. Results must be read to the end.
+    @contextmanager
+    def statement(self, query):
+        with self.connection() as conn:
+            with self._lock:
+                statements = self._statements.setdefault(conn, {})
+            cursor = statements.get(query)
+            if cursor is None:
+                cursor = statements[query] = conn.cursor(prepared=True)
+            yield cursor
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._opened,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time': round(self._wait_time, 3),
+                'reconnects': self._reconnects,
+                'statements': sum(len(statements) for statements in self._statements.values()),
+            }
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+                self._statements.pop(conn, None)
+            try:
+                conn.close()
+            except _driver().Error:
+                pass
+
+
+# Build a pool from the [database] section of a Streamlit secrets file, for
+# command line tools that run outside Streamlit
+def pool_from_secrets(path='.streamlit/secrets.toml', **kwargs):
+    with open(path, 'rb') as f:
+        database = tomllib.load(f)['database']
+    return ConnectionPool(
+        host=database['host'],
+        port=database['port'],
+        database=database['database'],
+        user=database['username'],
+        password=database['password'],
+        **kwargs
+    )
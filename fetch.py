@@ -0,0 +1,109 @@
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+# Kind of a column from its first non-null value: 'int', 'float', 'text',
+# 'datetime' or 'object'; None while only NULLs have been seen
+def column_kind(values):
+    sample = next((value for value in values if value is not None), None)
+    if sample is None:
+        return None
+    if isinstance(sample, bool):
+        return 'object'
+    if isinstance(sample, int):
+        return 'int'
+    if isinstance(sample, (float, Decimal)):
+        return 'float'
+    if isinstance(sample, str):
+        return 'text'
+    if isinstance(sample, (datetime.date, datetime.datetime)):
+        return 'datetime'
+    return 'object'
+
+
+# Turn one column of Python values from the driver into a typed array of
+# the given kind: numbers to int64/float64 (Decimal included, integers with
+# NULLs to float64), text to a dictionary-encoded Categorical, dates to
+# datetime64. A column with no kind yet (only NULLs) becomes NaN floats.
+def to_array(values, kind=None):
+    if kind is None:
+        kind = column_kind(values)
+    if kind is None:
+        return np.full(len(values), np.nan)
+    if kind == 'int' and not any(value is None for value in values):
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    if kind in ('int', 'float'):
+        return np.fromiter((np.nan if value is None else float(value) for value in values), dtype=np.float64, count=len(values))
+    if kind == 'text':
+        categories = pd.unique(np.array([value for value in values if value is not None], dtype=object))
+        return pd.Categorical(values, categories=categories)
+    if kind == 'datetime':
+        return pd.to_datetime(pd.Series(values, dtype=object)).to_numpy()
+    return np.array(values, dtype=object)
+
+
+# Read the cursor's result in chunks of `chunk_size` rows and yield each
+# chunk as a dict of typed column arrays, so only one chunk of Python tuples
+# is alive. A column's kind is fixed by the first chunk with a non-null
+# value in it and used for every later chunk.
+def iter_columns(cursor, chunk_size=10000):
+    columns = [desc[0] for desc in cursor.description]
+    kinds = [None] * len(columns)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        values = list(zip(*rows))
+        del rows
+        chunk = {}
+        for index, column in enumerate(columns):
+            column_values = list(values[index])
+            values[index] = None
+            if kinds[index] is None:
+                kinds[index] = column_kind(column_values)
+            chunk[column] = to_array(column_values, kinds[index])
+        yield chunk
+
+
+def chunk_rows(chunk):
+    return len(next(iter(chunk.values()))) if chunk else 0
+
+
+# All-NULL stand-in for a chunk read before its column's kind was known,
+# typed like the column's other chunks
+def _null_like(template, length):
+    if isinstance(template, pd.Categorical):
+        return pd.Categorical.from_codes(np.full(length, -1), categories=template.categories[:0])
+    if template.dtype.kind == 'M':
+        return np.full(length, np.datetime64('NaT'), dtype=template.dtype)
+    if template.dtype == object:
+        return np.full(length, None, dtype=object)
+    return np.full(length, np.nan)
+
+
+def _concat_column(parts):
+    typed = next((part for part in parts if not pd.isna(part).all()), None)
+    if typed is not None and not (isinstance(typed, np.ndarray) and typed.dtype.kind == 'f'):
+        parts = [part if part is typed or not pd.isna(part).all() else _null_like(typed, len(part)) for part in parts]
+    if isinstance(parts[0], pd.Categorical):
+        return union_categoricals(parts)
+    return np.concatenate(parts)
+
+
+# Combine the chunks from iter_columns into one frame. Each column is taken
+# out of the chunks as it is merged, so the chunk arrays are released as the
+# frame is built and peak memory stays near one copy of the result.
+# Categoricals are merged with their categories kept in order of first appearance.
+def concat_chunks(chunks, columns):
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for column in columns:
+        parts = [chunk.pop(column) for chunk in chunks]
+        data[column] = parts[0] if len(parts) == 1 else _concat_column(parts)
+        del parts
+    return pd.DataFrame(data, columns=columns, copy=False)
@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from imdb_loader import file_signature, load_imdb, normalize, schema
+
+
+# Metrics of one chunk of (normalized) IMDB rows, as plain dicts so partial
+# results from worker processes are cheap to send back and merge. Dicts keep
+# the order in which labels first appear, like value_counts() does for ties.
+def summarize(data, max_points=5000):
+    labels = data['label'].astype(object)
+    ratings = (data['rating'] * 10).round()
+    by_label = data.groupby(labels, sort=False)
+    return {
+        'rows': len(data),
+        'label_counts': by_label.size().to_dict(),
+        'budget_by_label': by_label['budget'].sum().to_dict(),
+        'budget_total': float(data['budget'].sum()),
+        'rating_counts': ratings.value_counts(sort=False).to_dict(),
+        'year_rating_counts': data.groupby([data['release_year'], ratings], sort=False).size().to_dict(),
+        'points': data[['release_year', 'rating']] if len(data) <= max_points else None,
+    }
+
+
+def summarize_raw(chunk, max_points):
+    return summarize(normalize(chunk), max_points)
+
+
+def _add(totals, counts):
+    for key, value in counts.items():
+        totals[key] = totals.get(key, 0) + value
+
+
+class ImdbAggregates:
+    # Everything the IMDB charts need, accumulated over any number of chunks.
+    # Individual (year, rating) points are only kept up to `max_points` rows;
+    # past that the relationship chart draws the year/rating bins instead.
+    def __init__(self, max_points=5000):
+        self.max_points = max_points
+        self.rows = 0
+        self.label_counts = {}
+        self.budget_by_label_totals = {}
+        self.budget_total = 0.0
+        self.rating_counts = {}
+        self.year_rating_counts = {}
+        self._points = []
+
+    def add(self, partial):
+        self.rows += partial['rows']
+        _add(self.label_counts, partial['label_counts'])
+        _add(self.budget_by_label_totals, partial['budget_by_label'])
+        self.budget_total += partial['budget_total']
+        _add(self.rating_counts, partial['rating_counts'])
+        _add(self.year_rating_counts, partial['year_rating_counts'])
+        if self._points is not None and partial['points'] is not None and self.rows <= self.max_points:
+            self._points.append(partial['points'])
+        else:
+            self._points = None
+
+    # Movies per label, largest first (same as data['label'].value_counts())
+    def count_by_label(self):
+        counts = pd.Series(self.label_counts, dtype='int64')
+        counts = counts.sort_values(ascending=False, kind='stable')
+        return pd.DataFrame({'label': counts.index.astype(str), 'count': counts.values})
+
+    # Total budget per label, sorted by label (same as groupby('label')['budget'].sum())
+    def budget_by_label(self):
+        return pd.Series(self.budget_by_label_totals, dtype='float64').sort_index()
+
+    # Movies per rating, sorted by rating (same as data['rating'].value_counts().sort_index())
+    def rating_distribution(self):
+        counts = pd.Series(self.rating_counts, dtype='int64')
+        counts.index = counts.index.astype('int64') / 10.0
+        return counts.sort_index()
+
+    # Movies per (release year, rating) bin
+    def year_rating(self):
+        rows = [(year, rating / 10.0, count) for (year, rating), count in self.year_rating_counts.items()]
+        return pd.DataFrame(rows, columns=['release_year', 'rating', 'count'])
+
+    # Individual (release_year, rating) rows, or None for large datasets
+    @property
+    def points(self):
+        if self._points is None:
+            return None
+        if not self._points:
+            return pd.DataFrame({'release_year': pd.Series(dtype='int16'), 'rating': pd.Series(dtype='float64')})
+        return pd.concat(self._points, ignore_index=True)
+
+
+def aggregate_frame(data, max_points=5000):
+    aggregates = ImdbAggregates(max_points)
+    aggregates.add(summarize(data, max_points))
+    return aggregates
+
+
+# Stream the CSV in chunks and aggregate it in one pass. With processes > 0
+# chunks are summarized on a process pool; at most two chunks per process
+# are in flight, so memory stays bounded by the chunk size either way.
+def aggregate_file(path, chunksize=100000, processes=0, max_points=5000):
+    aggregates = ImdbAggregates(max_points)
+    reader = pd.read_csv(path, sep=";", dtype=schema, chunksize=chunksize)
+    if not processes:
+        for chunk in reader:
+            aggregates.add(summarize_raw(chunk, max_points))
+        return aggregates
+
+    # Workers are spawned, not forked: the dashboard process already runs
+    # threads (scheduler, TTS, retries) whose locks a forked child would
+    # inherit in whatever state they were in
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = deque()
+        for chunk in reader:
+            pending.append(executor.submit(summarize_raw, chunk, max_points))
+            if len(pending) >= processes * 2:
+                aggregates.add(pending.popleft().result())
+        # Results are merged in file order, so label order matches a single pass
+        while pending:
+            aggregates.add(pending.popleft().result())
+    return aggregates
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+# Aggregates for the dashboard, recomputed only when the source file changes.
+# Files up to `max_in_memory_bytes` go through the typed, cached loader; larger
+# scrapes are streamed from the CSV in chunks.
+def load_aggregates(path="dataset/imdbscrap.csv", max_in_memory_bytes=64 * 1024 * 1024, chunksize=100000, processes=0, max_points=5000):
+    signature = file_signature(path)
+    with _lock:
+        entry = _loaded.get(path)
+        if entry is None or entry[0] != signature:
+            if os.path.getsize(path) <= max_in_memory_bytes:
+                aggregates = aggregate_frame(load_imdb(path), max_points)
+            else:
+                aggregates = aggregate_file(path, chunksize, processes, max_points)
+            entry = (signature, aggregates)
+            _loaded[path] = entry
+    return entry[1]
@@ -0,0 +1,126 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+
+import pandas as pd
+
+# Column types for the scraped CSV; duration and rating are converted after reading
+schema = {
+    'name': 'string',
+    'release_year': 'int16',
+    'label': 'category',
+    'duration': 'string',
+    'rating': 'float64',
+    'budget': 'float64',
+    'gross': 'float64',
+}
+
+# Parquet needs pyarrow; without it the cache falls back to pickle. Only
+# its presence is checked here, pandas imports it when the cache is read.
+cache_format = 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'pickle'
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+# Convert durations like "1h 36m", "2h" or "45m" to minutes
+def parse_duration(duration):
+    parts = duration.str.extract(r'^\s*(?:(\d+)h)?\s*(?:(\d+)m)?\s*$').astype('float64')
+    minutes = parts[0].fillna(0) * 60 + parts[1].fillna(0)
+    minutes[parts[0].isna() & parts[1].isna()] = float('nan')
+    return minutes.astype('Int16')
+
+
+def read_imdb_csv(path):
+    return normalize(pd.read_csv(path, sep=";", dtype=schema))
+
+
+# Apply the one-time conversions: duration in minutes, rating on a 0-10 scale
+def normalize(data):
+    data = data.assign(
+        duration=parse_duration(data['duration']),
+        rating=data['rating'] / 10.0,
+    )
+    return data.rename(columns={'duration': 'duration_minutes'})
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(path, cache_dir):
+    base = os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0])
+    return base + ('.parquet' if cache_format == 'parquet' else '.pkl'), base + '.json'
+
+
+def _read_cache(cache_path):
+    if cache_format == 'parquet':
+        return pd.read_parquet(cache_path)
+    return pd.read_pickle(cache_path)
+
+
+def _write_cache(data, cache_path):
+    tmp_path = cache_path + '.tmp'
+    if cache_format == 'parquet':
+        data.to_parquet(tmp_path, index=False)
+    else:
+        data.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+
+
+# Load the typed frame from the binary cache, rebuilding it from the CSV
+# when the source file's size/mtime changed and its content hash differs
+def load_cached(path, cache_dir='.cache'):
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path, meta_path = cache_paths(path, cache_dir)
+    signature = file_signature(path)
+
+    meta = None
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    if meta is not None and meta.get('format') == cache_format:
+        if all(meta.get(key) == value for key, value in signature.items()):
+            return _read_cache(cache_path)
+        # Touched but unchanged (e.g. a fresh checkout): keep the cache
+        digest = file_hash(path)
+        if meta.get('sha256') == digest:
+            meta.update(signature)
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+            return _read_cache(cache_path)
+    else:
+        digest = file_hash(path)
+
+    data = read_imdb_csv(path)
+    _write_cache(data, cache_path)
+    with open(meta_path, 'w') as f:
+        json.dump(dict(signature, sha256=digest, format=cache_format), f)
+    return data
+
+
+# Return the IMDB dataset. The typed frame is kept in memory per process and
+# only reloaded when the source file changes; callers get their own copy, so
+# changing it never touches the cached frame. (load_aggregates only calls
+# this when the file changed, so the copy is not made per rerun.)
+def load_imdb(path="dataset/imdbscrap.csv", cache_dir='.cache'):
+    signature = file_signature(path)
+    with _lock:
+        entry = _loaded.get(path)
+        if entry is None or entry[0] != signature:
+            entry = (signature, load_cached(path, cache_dir))
+            _loaded[path] = entry
+    return entry[1].copy()
+
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class LastGoodStore:
+    # Last successful result of each AW chart (and of the filter options),
+    # per set of filters, kept on disk with the time it was produced. While
+    # MySQL is slow or unreachable the dashboard shows these instead, and a
+    # background thread keeps retrying the real query.
+    def __init__(self, directory='.last_good', rewrite_interval=60):
+        self.directory = directory
+        # Seconds between rewrites of a file whose data has not changed, only
+        # to move its timestamp; the fallback caption shows minutes anyway
+        self.rewrite_interval = rewrite_interval
+        self._entries = {}  # (name, key) -> (value, saved, encoded data, saved time on disk)
+        self._retrying = set()
+        self._lock = threading.Lock()
+
+    def _path(self, name, key):
+        digest = hashlib.sha256(repr(tuple(key)).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}-{digest}.json")
+
+    # (value, saved timestamp) or None; the file is only read on the first
+    # call after a restart, later calls are answered from memory
+    def get(self, name, key, decode=json.loads):
+        with self._lock:
+            entry = self._entries.get((name, key))
+        if entry is None:
+            try:
+                with open(self._path(name, key), encoding='utf-8') as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                return None
+            entry = (decode(stored['data']), stored['saved'], stored['data'], stored['saved'])
+            with self._lock:
+                entry = self._entries.setdefault((name, key), entry)
+        return entry[0], entry[1]
+
+    def _write(self, name, key, saved, data):
+        path = self._path(name, key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'key': list(key), 'saved': saved, 'data': data}, f)
+        os.replace(tmp, path)
+
+    # Record `value` as the latest good result, saved now. Encoding is
+    # skipped when the value is the same object as the stored one. When the
+    # data has not changed only the timestamp moves: it is always updated in
+    # memory and written to disk at most once per rewrite_interval.
+    def put(self, name, key, value, encode=json.dumps):
+        saved = time.time()
+        with self._lock:
+            entry = self._entries.get((name, key))
+        data = entry[2] if entry is not None and entry[0] is value else encode(value)
+        written = entry[3] if entry is not None and entry[2] == data else None
+        if written is None or saved - written >= self.rewrite_interval:
+            self._write(name, key, saved, data)
+            written = saved
+        with self._lock:
+            self._entries[(name, key)] = (value, saved, data, written)
+
+    def retrying(self, name, key):
+        with self._lock:
+            return (name, key) in self._retrying
+
+    # Call `load` in a background thread, after each delay in turn, until it
+    # succeeds; `load` is expected to put its result. At most one retry loop
+    # runs per (name, key).
+    def retry(self, name, key, load, delays=(5, 10, 30, 60, 60, 60)):
+        with self._lock:
+            if (name, key) in self._retrying:
+                return
+            self._retrying.add((name, key))
+
+        def worker():
+            try:
+                for delay in delays:
+                    time.sleep(delay)
+                    try:
+                        load()
+                        return
+                    except Exception:
+                        continue
+            finally:
+                with self._lock:
+                    self._retrying.discard((name, key))
+
+        threading.Thread(target=worker, name=f'last-good-{name}', daemon=True).start()
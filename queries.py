@@ -0,0 +1,265 @@
+import argparse
+from collections import namedtuple
+
+# Filters of the AW charts. Being a tuple, a set of filters is hashable and
+# ends up as part of the query cache key through the statement parameters.
+Filters = namedtuple('Filters', ['year_from', 'year_to', 'category', 'territory'])
+
+# What the dashboard shows when nothing is picked in the sidebar
+default_filters = Filters(2001, 2004, None, None)
+
+# Every AW query of the dashboard, by name: (SQL with %s placeholders,
+# function building the parameters from the filters). The SQL text never
+# changes, so each statement is prepared once per pooled connection and
+# only the parameters travel on later runs.
+registry = {}
+
+
+def register(name, sql, params=lambda filters: ()):
+    registry[name] = (sql, params)
+
+
+# Load a registered query as a prepared statement through `db` (a charts.Database)
+def run(db, name, filters=None, **options):
+    sql, params = registry[name]
+    return db.query(sql, params(filters or default_filters, **options), prepared=True)
+
+
+# Optional filters are written as "(%s IS NULL OR ...)" so a single statement
+# serves both the filtered and the unfiltered view. Category and territory
+# are semi-joins on the fact table's keys: no extra rows are joined in when
+# they are not set, and sales without a match are kept as before.
+category_filter_sql = """
+    (%s IS NULL OR fis.ProductKey IN (
+        SELECT dp.ProductKey
+        FROM dimproduct dp
+        JOIN dimproductsubcategory dps ON dp.ProductSubcategoryKey = dps.ProductSubcategoryKey
+        JOIN dimproductcategory pc ON dps.ProductCategoryKey = pc.ProductCategoryKey
+        WHERE pc.EnglishProductCategoryName = %s
+    ))
+"""
+
+territory_filter_sql = """
+    (%s IS NULL OR fis.SalesTerritoryKey IN (
+        SELECT SalesTerritoryKey FROM dimsalesterritory WHERE SalesTerritoryGroup = %s
+    ))
+"""
+
+
+def sales_params(filters):
+    return (filters.year_from, filters.year_to,
+            filters.category, filters.category,
+            filters.territory, filters.territory)
+
+
+# Filter options shown in the sidebar
+register('order_years', "SELECT MIN(CalendarYear) AS year_from, MAX(CalendarYear) AS year_to FROM dimtime")
+register('product_categories', """
+    SELECT EnglishProductCategoryName AS category
+    FROM dimproductcategory
+    ORDER BY EnglishProductCategoryName
+""")
+register('territory_groups', """
+    SELECT DISTINCT SalesTerritoryGroup AS territory
+    FROM dimsalesterritory
+    ORDER BY SalesTerritoryGroup
+""")
+
+# Comparison (not affected by the filters)
+register('comparisonaw', """
+    SELECT DepartmentName,
+           COUNT(EmployeeKey) AS employee_count
+    FROM dimemployee
+    GROUP BY DepartmentName
+""")
+register('comparisonaw_rollup', "SELECT DepartmentName, employee_count FROM rollup_department_employees")
+
+# Relationship
+sales_by_category_sql = f"""
+    SELECT pc.EnglishProductCategoryName AS category,
+           fis.SalesAmount
+    FROM factinternetsales fis
+    JOIN dimtime dt ON fis.OrderDateKey = dt.TimeKey
+    JOIN dimproduct dp ON fis.ProductKey = dp.ProductKey
+    JOIN dimproductsubcategory dps ON dp.ProductSubcategoryKey = dps.ProductSubcategoryKey
+    JOIN dimproductcategory pc ON dps.ProductCategoryKey = pc.ProductCategoryKey
+    WHERE dt.CalendarYear BETWEEN %s AND %s
+      AND (%s IS NULL OR pc.EnglishProductCategoryName = %s)
+      AND {territory_filter_sql}
+"""
+
+register('relationshipaw_stats', f"""
+    SELECT category,
+           COUNT(*) AS sales_count,
+           MIN(SalesAmount) AS min_amount,
+           MAX(SalesAmount) AS max_amount
+    FROM ({sales_by_category_sql}) s
+    GROUP BY category
+""", sales_params)
+register('relationshipaw', sales_by_category_sql, sales_params)
+# One scan of the sales: each row carries its category's range through
+# window functions, instead of joining a second aggregate over the same rows
+register('relationshipaw_binned', f"""
+    SELECT category,
+           FLOOR((SalesAmount - min_amount) * %s / (max_amount - min_amount + 0.0001)) AS bin,
+           MIN(SalesAmount) AS bin_low,
+           MAX(SalesAmount) AS bin_high,
+           AVG(SalesAmount) AS SalesAmount,
+           COUNT(*) AS sales_count
+    FROM (
+        SELECT s.category,
+               s.SalesAmount,
+               MIN(s.SalesAmount) OVER (PARTITION BY s.category) AS min_amount,
+               MAX(s.SalesAmount) OVER (PARTITION BY s.category) AS max_amount
+        FROM ({sales_by_category_sql}) s
+    ) ranged
+    GROUP BY category, bin
+""", lambda filters, bins=100: (bins,) + sales_params(filters))
+
+# Composition (filtered by territory only)
+register('compositionaw', """
+    SELECT
+        st.SalesTerritoryRegion AS region,
+        COUNT(r.ResellerKey) AS reseller_count
+    FROM
+        dimreseller r
+    JOIN
+        dimgeography g ON r.GeographyKey = g.GeographyKey
+    JOIN
+        dimsalesterritory st ON g.SalesTerritoryKey = st.SalesTerritoryKey
+    WHERE
+        (%s IS NULL OR st.SalesTerritoryGroup = %s)
+    GROUP BY
+        st.SalesTerritoryRegion
+""", lambda filters: (filters.territory, filters.territory))
+register('compositionaw_rollup', "SELECT region, reseller_count FROM rollup_region_resellers")
+
+# Distribution: order quantity per day, week, month or quarter. Each period
+# is labelled with the first calendar day of its bucket, taken from dimtime,
+# so every fact row of a bucket lands on the same date whatever day it has.
+register('distributionaw_day', f"""
+    SELECT
+        dt.FullDateAlternateKey AS period,
+        'day' AS granularity,
+        SUM(fis.OrderQuantity) AS OrderQuantity
+    FROM
+        factinternetsales fis
+    JOIN
+        dimtime dt ON fis.OrderDateKey = dt.TimeKey
+    WHERE
+        dt.CalendarYear BETWEEN %s AND %s
+        AND {category_filter_sql}
+        AND {territory_filter_sql}
+    GROUP BY
+        dt.FullDateAlternateKey
+    ORDER BY
+        dt.FullDateAlternateKey
+""", sales_params)
+
+# dimtime columns identifying a bucket, per granularity
+period_buckets = {
+    'week': ['CalendarYear', 'WeekNumberOfYear'],
+    'month': ['CalendarYear', 'MonthNumberOfYear'],
+    'quarter': ['CalendarYear', 'CalendarQuarter'],
+}
+
+for granularity, columns in period_buckets.items():
+    register(f'distributionaw_{granularity}', f"""
+        SELECT
+            b.period,
+            '{granularity}' AS granularity,
+            SUM(fis.OrderQuantity) AS OrderQuantity
+        FROM
+            factinternetsales fis
+        JOIN
+            dimtime dt ON fis.OrderDateKey = dt.TimeKey
+        JOIN (
+            SELECT {', '.join(columns)}, MIN(FullDateAlternateKey) AS period
+            FROM dimtime
+            GROUP BY {', '.join(columns)}
+        ) b ON {' AND '.join(f'b.{column} = dt.{column}' for column in columns)}
+        WHERE
+            dt.CalendarYear BETWEEN %s AND %s
+            AND {category_filter_sql}
+            AND {territory_filter_sql}
+        GROUP BY
+            b.period
+        ORDER BY
+            b.period
+    """, sales_params)
+
+register('distributionaw_rollup', """
+    SELECT CalendarYear, MonthNumberOfYear, 'month' AS granularity, OrderQuantity
+    FROM rollup_monthly_order_quantity
+    WHERE CalendarYear BETWEEN %s AND %s
+    ORDER BY CalendarYear, MonthNumberOfYear
+""", lambda filters: (filters.year_from, filters.year_to))
+
+
+# Covering indexes the filtered views need, by the table alias used in the
+# queries above: the year range is resolved on dimtime, the fact rows are
+# then reached through OrderDateKey and read without touching the table rows
+index_advice = {
+    'fis': "CREATE INDEX ix_fis_orderdate_product ON factinternetsales "
+           "(OrderDateKey, ProductKey, SalesTerritoryKey, OrderQuantity, SalesAmount)",
+    'dt': "CREATE INDEX ix_dimtime_year ON dimtime "
+          "(CalendarYear, TimeKey, FullDateAlternateKey, WeekNumberOfYear, MonthNumberOfYear, CalendarQuarter)",
+    'r': "CREATE INDEX ix_dimreseller_geography ON dimreseller (GeographyKey, ResellerKey)",
+}
+
+
+# Run EXPLAIN on every registered query and return its plan rows, plus the
+# indexes from index_advice for tables that are scanned or read past the
+# index (a covered read shows "Using index" in Extra)
+def explain(pool, filters=default_filters):
+    plans, advice = {}, {}
+    for name, (sql, params) in registry.items():
+        try:
+            with pool.cursor(dictionary=True) as cursor:
+                cursor.execute("EXPLAIN " + sql, params(filters))
+                plans[name] = cursor.fetchall()
+        except Exception as error:
+            # e.g. the rollup tables have not been created yet
+            plans[name] = error
+            continue
+        for row in plans[name]:
+            statement = index_advice.get(row['table'])
+            if statement is None:
+                continue
+            covered = 'Using index' in (row['Extra'] or '').split('; ')
+            if row['type'] == 'ALL' or not covered:
+                advice.setdefault(statement, []).append(name)
+    return plans, advice
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the registered AdventureWorks dashboard queries")
+    parser.add_argument('command', choices=['explain'], help="EXPLAIN every query and print the indexes it needs")
+    parser.add_argument('--secrets', default='.streamlit/secrets.toml', help="secrets file with the [database] section")
+    args = parser.parse_args()
+
+    # Imported here so the registry itself does not need the MySQL driver
+    from db_pool import pool_from_secrets
+    pool = pool_from_secrets(args.secrets, size=1)
+    try:
+        plans, advice = explain(pool)
+    finally:
+        pool.close()
+
+    for name, rows in plans.items():
+        print(f"-- {name}")
+        if isinstance(rows, Exception):
+            print(f"   skipped: {rows}")
+            continue
+        for row in rows:
+            print(f"   {row['table'] or '':<20} {row['type'] or '':<8} key={row['key'] or '-':<28} rows={row['rows'] or 0:<10} {row['Extra'] or ''}")
+    if advice:
+        print("\n-- Recommended indexes")
+        for statement, names in advice.items():
+            print(f"{statement};  -- {', '.join(sorted(set(names)))}")
+    else:
+        print("\nAll registered queries are covered by their indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Normalize SQL text so that whitespace/formatting differences map to the same key
+def normalize_sql(query):
+    query = re.sub(r"\s+", " ", query).strip()
+    return query.rstrip(";").strip()
+
+
+# Build the cache key from the normalized SQL text and its parameters
+def make_key(query, params=None):
+    if params is None:
+        params = ()
+    elif isinstance(params, dict):
+        params = tuple(sorted(params.items()))
+    else:
+        params = tuple(params)
+    return (normalize_sql(query), params)
+
+
+# Estimate how many bytes a cached value occupies
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    # Process-wide result cache shared by every session. Entries expire after
+    # `ttl` seconds and the least recently used ones are evicted once the
+    # total size goes over `max_bytes`.
+    def __init__(self, ttl=3600, max_bytes=256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            # Values bigger than the whole cache are never stored
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, time.monotonic(), size)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def get_or_load(self, query, params, loader):
+        key = make_key(query, params)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        # Only one caller per key goes to the database; concurrent callers
+        # for the same key wait for that result instead of stampeding
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+            value = loader()
+            self.put(key, value)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return value
+
+    def refresh(self, query, params, loader):
+        value = loader()
+        self.put(make_key(query, params), value)
+        return value
+
+    # Drop one query (all parameter sets when params is None) or everything
+    def invalidate(self, query=None, params=None):
+        with self._lock:
+            if query is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            sql = normalize_sql(query)
+            for key in list(self._entries):
+                if key[0] == sql and (params is None or key == make_key(query, params)):
+                    self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry[2]
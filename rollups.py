@@ -0,0 +1,168 @@
+import argparse
+
+from db_pool import pool_from_secrets
+
+# Summary tables read by the AW charts instead of scanning the base tables
+ddl = [
+    """
+    CREATE TABLE IF NOT EXISTS rollup_monthly_order_quantity (
+        CalendarYear SMALLINT NOT NULL,
+        MonthNumberOfYear TINYINT NOT NULL,
+        EnglishMonthName VARCHAR(20) NOT NULL,
+        OrderQuantity BIGINT NOT NULL,
+        PRIMARY KEY (CalendarYear, MonthNumberOfYear)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_department_employees (
+        DepartmentName VARCHAR(50) NOT NULL PRIMARY KEY,
+        employee_count INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_region_resellers (
+        region VARCHAR(50) NOT NULL PRIMARY KEY,
+        reseller_count INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_watermark (
+        rollup_name VARCHAR(64) NOT NULL PRIMARY KEY,
+        last_key BIGINT NOT NULL
+    )
+    """,
+]
+
+# Aggregate the fact rows between two OrderDateKey values (both inclusive)
+# into monthly totals; the months they cover are deleted first
+monthly_increment_sql = """
+    INSERT INTO rollup_monthly_order_quantity (CalendarYear, MonthNumberOfYear, EnglishMonthName, OrderQuantity)
+    SELECT
+        dt.CalendarYear,
+        dt.MonthNumberOfYear,
+        MIN(dt.EnglishMonthName),
+        SUM(fis.OrderQuantity)
+    FROM
+        factinternetsales fis
+    JOIN
+        dimtime dt ON fis.OrderDateKey = dt.TimeKey
+    WHERE
+        fis.OrderDateKey >= %s AND fis.OrderDateKey <= %s
+    GROUP BY
+        dt.CalendarYear, dt.MonthNumberOfYear
+"""
+
+# First TimeKey, year and month of the month a TimeKey falls in
+month_start_sql = """
+    SELECT MIN(m.TimeKey), MIN(d.CalendarYear), MIN(d.MonthNumberOfYear)
+    FROM dimtime d
+    JOIN dimtime m ON m.CalendarYear = d.CalendarYear AND m.MonthNumberOfYear = d.MonthNumberOfYear
+    WHERE d.TimeKey = %s
+"""
+
+# Drop the monthly totals from a (year, month) on, before they are recomputed
+delete_months_sql = """
+    DELETE FROM rollup_monthly_order_quantity
+    WHERE CalendarYear > %s OR (CalendarYear = %s AND MonthNumberOfYear >= %s)
+"""
+
+# The dimension counts are small, so they are recomputed on every refresh
+dimension_refresh_sql = [
+    "DELETE FROM rollup_department_employees",
+    """
+    INSERT INTO rollup_department_employees (DepartmentName, employee_count)
+    SELECT DepartmentName, COUNT(EmployeeKey)
+    FROM dimemployee
+    GROUP BY DepartmentName
+    """,
+    "DELETE FROM rollup_region_resellers",
+    """
+    INSERT INTO rollup_region_resellers (region, reseller_count)
+    SELECT st.SalesTerritoryRegion, COUNT(r.ResellerKey)
+    FROM dimreseller r
+    JOIN dimgeography g ON r.GeographyKey = g.GeographyKey
+    JOIN dimsalesterritory st ON g.SalesTerritoryKey = st.SalesTerritoryKey
+    GROUP BY st.SalesTerritoryRegion
+    """,
+]
+
+
+def create_tables(cursor):
+    for statement in ddl:
+        cursor.execute(statement)
+
+
+def get_watermark(cursor, name):
+    cursor.execute("SELECT last_key FROM rollup_watermark WHERE rollup_name = %s", (name,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def set_watermark(cursor, name, last_key):
+    cursor.execute(
+        "INSERT INTO rollup_watermark (rollup_name, last_key) VALUES (%s, %s) AS new "
+        "ON DUPLICATE KEY UPDATE last_key = new.last_key",
+        (name, last_key),
+    )
+
+
+# Bring the rollups up to date. OrderDateKey is a day key, so orders keep
+# arriving for the day of the watermark after a refresh: every refresh
+# therefore recomputes the watermark's month, plus everything newer, from
+# the base tables. The cost tracks one month of rows, not the table size.
+# Changes to earlier months are only picked up by a full rebuild, which
+# recomputes everything from the base tables in the same transaction.
+def refresh(pool, full=False):
+    with pool.connection() as conn:
+        cursor = conn.cursor(buffered=True)
+        try:
+            create_tables(cursor)
+            conn.start_transaction()
+            if full:
+                cursor.execute("DELETE FROM rollup_watermark WHERE rollup_name = 'monthly_order_quantity'")
+            watermark = get_watermark(cursor, 'monthly_order_quantity')
+            # Fix the upper bound first so rows arriving mid-refresh wait for the next run
+            cursor.execute("SELECT COALESCE(MAX(OrderDateKey), 0) FROM factinternetsales")
+            high = max(cursor.fetchone()[0], watermark)
+
+            low, year, month = 0, 0, 0
+            if watermark:
+                cursor.execute(month_start_sql, (watermark,))
+                row = cursor.fetchone()
+                if row[0] is not None:
+                    low, year, month = row
+            cursor.execute(delete_months_sql, (year, year, month))
+            cursor.execute(monthly_increment_sql, (low, high))
+            set_watermark(cursor, 'monthly_order_quantity', high)
+
+            for statement in dimension_refresh_sql:
+                cursor.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return {'from_key': low, 'to_key': high}
+
+
+def rebuild(pool):
+    return refresh(pool, full=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the AdventureWorks rollup tables used by the dashboard")
+    parser.add_argument('command', choices=['refresh', 'rebuild'], help="incremental refresh or full rebuild")
+    parser.add_argument('--secrets', default='.streamlit/secrets.toml', help="secrets file with the [database] section")
+    args = parser.parse_args()
+
+    pool = pool_from_secrets(args.secrets, size=1)
+    try:
+        result = refresh(pool) if args.command == 'refresh' else rebuild(pool)
+    finally:
+        pool.close()
+    print(f"{args.command}: OrderDateKey {result['from_key']} -> {result['to_key']}")
+
+
+if __name__ == "__main__":
+    main()
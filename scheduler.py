@@ -0,0 +1,36 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class QueryScheduler:
+    # Runs the dashboard's data loaders in parallel on a shared thread pool.
+    # Results are handed back in completion order, so each chart can be drawn
+    # as soon as its own data is ready.
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dashboard-query')
+
+    # Tasks run in a copy of the caller's context, so context variables
+    # (e.g. the tracing scope) carry over to the worker threads
+    def submit(self, tasks):
+        return {self.executor.submit(contextvars.copy_context().run, task): name for name, task in tasks.items()}
+
+    # Yield (name, result, error) as tasks finish. Tasks still running after
+    # `timeout` seconds are reported with a TimeoutError; they keep running
+    # in the background so their result can land in the query cache.
+    def as_completed(self, futures, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = set(futures)
+        while pending:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                error = future.exception()
+                yield futures[future], (None if error else future.result()), error
+        for future in pending:
+            yield futures[future], None, TimeoutError(f"{futures[future]} did not finish within {timeout}s")
+
+    def run(self, tasks, timeout=None):
+        return self.as_completed(self.submit(tasks), timeout)
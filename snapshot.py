@@ -0,0 +1,176 @@
+import argparse
+import datetime
+import html
+import json
+import os
+import shutil
+import tomllib
+
+import charts
+from content import explanations, sections
+from db_pool import pool_from_secrets
+from imdb_agg import load_aggregates
+from tts import TTSCache, make_synthesizer
+
+aw_charts = ['comparisonaw', 'compositionaw', 'relationshipaw', 'distributionaw']
+imdb_charts = ['comparisonimdb', 'compositionimdb', 'relationshipimdb', 'distributionimdb']
+
+
+class Snapshot:
+    # A pre-rendered dashboard: figure JSON, MP3 clips and a static HTML
+    # bundle in one versioned directory, served without touching MySQL
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest['version']
+        self._figures = {}
+        self._audio = {}
+
+    def figure(self, name):
+        import plotly.io as pio
+
+        if name not in self._figures:
+            with open(os.path.join(self.directory, self.manifest['charts'][name]['figure'])) as f:
+                self._figures[name] = pio.from_json(f.read())
+        return self._figures[name]
+
+    def audio(self, name):
+        if name not in self._audio:
+            with open(os.path.join(self.directory, self.manifest['charts'][name]['audio']), 'rb') as f:
+                self._audio[name] = f.read()
+        return self._audio[name]
+
+
+# Directory of the version named in root/LATEST, or root itself if it is a snapshot
+def snapshot_directory(root):
+    pointer = os.path.join(root, 'LATEST')
+    if not os.path.exists(pointer):
+        return root
+    with open(pointer) as f:
+        return os.path.join(root, f.read().strip())
+
+
+def load_settings(path):
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def build_figures(pool, settings):
+    def setting(section, key, default):
+        return settings.get(section, {}).get(key, default)
+
+    db = charts.Database(pool)
+    use_rollups = setting('rollups', 'enabled', False)
+    aggregates = load_aggregates(
+        setting('imdb', 'path', "dataset/imdbscrap.csv"),
+        max_in_memory_bytes=setting('imdb', 'max_in_memory_mb', 64) * 1024 * 1024,
+        chunksize=setting('imdb', 'chunksize', 100000),
+        processes=setting('imdb', 'processes', 0),
+    )
+    return {
+        'comparisonaw': charts.figure_comparisonaw(charts.query_comparisonaw(db, use_rollups)),
+        'compositionaw': charts.figure_compositionaw(charts.query_compositionaw(db, use_rollups)),
+        'relationshipaw': charts.figure_relationshipaw(charts.query_relationshipaw(
+            db, setting('relationship', 'max_points', 100000), setting('relationship', 'bins', 100))),
+        'distributionaw': charts.figure_distributionaw(charts.query_distributionaw(db, use_rollups),
+                                                       setting('distribution', 'max_points', 250)),
+        'comparisonimdb': charts.figure_comparisonimdb(aggregates),
+        'compositionimdb': charts.figure_compositionimdb(aggregates),
+        'relationshipimdb': charts.figure_relationshipimdb(aggregates),
+        'distributionimdb': charts.figure_distributionimdb(aggregates),
+    }
+
+
+# Static page with every chart, its explanation and its audio clip
+def render_html(figures):
+    parts = []
+    for index, name in enumerate(aw_charts + imdb_charts):
+        title, subtitle, _ = sections[name]
+        chart_html = figures[name].to_html(full_html=False, include_plotlyjs='cdn' if index == 0 else False)
+        parts.append(f"""
+<section>
+  <h3>{html.escape(title)}</h3>
+  <p>{html.escape(subtitle)}</p>
+  {chart_html}
+  <p>Penjelasan:</p>
+  <p>{html.escape(explanations[name])}</p>
+  <audio controls preload="none" src="audio/{name}.mp3"></audio>
+</section>""")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Adventure Works Dataset & IMDB Data Scrapping Visualization</title>
+<style>
+body {{ background: #0e1117; color: white; font-family: sans-serif; margin: 2em; }}
+h1, h2, h4 {{ text-align: center; }}
+section {{ display: inline-block; vertical-align: top; width: 48%; padding: 1em; box-sizing: border-box; }}
+</style>
+</head>
+<body>
+<h1>Adventure Works Dataset &amp; IMDB Data Scrapping Visualization</h1>
+<h4>By Fariz - 21082010156</h4>
+{''.join(parts)}
+</body>
+</html>
+"""
+
+
+# Render every chart once and write a new snapshot version under `root`.
+# The version is built in a temporary directory and only then published by
+# updating root/LATEST, so a running app never sees a half-written snapshot.
+def build_snapshot(root, pool, settings, tts):
+    version = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    staging = os.path.join(root, f'.{version}.tmp')
+    os.makedirs(os.path.join(staging, 'figures'))
+    os.makedirs(os.path.join(staging, 'audio'))
+
+    figures = build_figures(pool, settings)
+    manifest = {'version': version, 'created': version, 'charts': {}}
+    for name, fig in figures.items():
+        with open(os.path.join(staging, 'figures', f'{name}.json'), 'w') as f:
+            f.write(fig.to_json())
+        with open(os.path.join(staging, 'audio', f'{name}.mp3'), 'wb') as f:
+            f.write(tts.get(explanations[name]))
+        manifest['charts'][name] = {'figure': f'figures/{name}.json', 'audio': f'audio/{name}.mp3'}
+    with open(os.path.join(staging, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_html(figures))
+    with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    target = os.path.join(root, version)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.replace(staging, target)
+    pointer = os.path.join(root, 'LATEST')
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(version)
+    os.replace(pointer + '.tmp', pointer)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render the whole dashboard into a static snapshot directory")
+    parser.add_argument('--secrets', default='.streamlit/secrets.toml', help="secrets file with the [database] section and settings")
+    parser.add_argument('--out', default='snapshots', help="directory the snapshot versions are written to")
+    parser.add_argument('--tts-backend', default=None, help="text-to-speech backend, defaults to [tts] backend or gtts")
+    args = parser.parse_args()
+
+    settings = load_settings(args.secrets)
+    tts_settings = settings.get('tts', {})
+    tts = TTSCache(
+        make_synthesizer(args.tts_backend or tts_settings.get('backend', 'gtts')),
+        directory=tts_settings.get('directory', '.tts_cache'),
+        lang='id',
+    )
+    pool = pool_from_secrets(args.secrets, size=1)
+    try:
+        target = build_snapshot(args.out, pool, settings, tts)
+    finally:
+        pool.close()
+    print(f"Snapshot written to {target}")
+
+
+if __name__ == "__main__":
+    main()
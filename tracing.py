@@ -0,0 +1,162 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger('dashboard.trace')
+
+# Spans of the rerun being traced, and the chart the current code works for.
+# Both are context variables so they follow tasks onto the scheduler threads.
+_run = contextvars.ContextVar('trace_run', default=None)
+_chart = contextvars.ContextVar('trace_chart', default=None)
+
+# perf_counter() at the start of the rerun until its first chart is drawn
+_started = contextvars.ContextVar('trace_started', default=None)
+
+# Time to first chart of the first rerun of this process and of the latest one
+_first_chart = {'cold_ms': None, 'last_ms': None}
+
+# Recent span durations per (chart, span name), for the p50/p95 summary
+_history = defaultdict(lambda: deque(maxlen=500))
+_history_lock = threading.Lock()
+
+
+# Stand-in returned while tracing is off, so instrumented code costs one
+# context variable lookup and nothing else
+class _NoopSpan:
+    enabled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_noop = _NoopSpan()
+
+
+class Span:
+    enabled = True
+
+    def __init__(self, run, name, attrs):
+        self.run = run
+        self.name = name
+        self.chart = _chart.get()
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = {
+            'span': self.name,
+            'chart': self.chart,
+            'ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'thread': threading.current_thread().name,
+        }
+        record.update(self.attrs)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        self.run.append(record)
+        with _history_lock:
+            _history[(self.chart, self.name)].append(record['ms'])
+        logger.info(json.dumps(record, default=str))
+        return False
+
+    # Attach attributes known only once the work is done (row counts, bytes)
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+# Time a block of work as a named span of the current chart
+def span(name, **attrs):
+    run = _run.get()
+    if run is None:
+        return _noop
+    return Span(run, name, attrs)
+
+
+# Attribute the spans opened inside the block to `chart`
+@contextmanager
+def chart(name):
+    token = _chart.set(name)
+    try:
+        yield
+    finally:
+        _chart.reset(token)
+
+
+# Start collecting spans for this rerun and return the list they are added
+# to; with enabled=False tracing is switched off for the rerun. `started` is
+# the perf_counter() value the time to first chart is measured from.
+def start_run(enabled=True, started=None):
+    run = [] if enabled else None
+    _run.set(run)
+    _started.set(started)
+    return run
+
+
+# Call after drawing a chart. The first call of a rerun records the time to
+# first chart, whether or not tracing is on, since it is the number that
+# tells how fast the dashboard starts.
+def chart_drawn():
+    started = _started.get()
+    if started is None:
+        return
+    _started.set(None)
+    record = {
+        'span': 'first_chart',
+        'chart': _chart.get(),
+        'ms': round((time.perf_counter() - started) * 1000, 3),
+        'thread': threading.current_thread().name,
+    }
+    with _history_lock:
+        if _first_chart['cold_ms'] is None:
+            _first_chart['cold_ms'] = record['ms']
+            record['cold'] = True
+        _first_chart['last_ms'] = record['ms']
+        _history[(None, 'first_chart')].append(record['ms'])
+    run = _run.get()
+    if run is not None:
+        run.append(record)
+    logger.info(json.dumps(record, default=str))
+
+
+def first_chart():
+    with _history_lock:
+        return dict(_first_chart)
+
+
+# Log every span as one JSON line on stderr
+def enable_logging():
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    index = min(int(round(q * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+# p50/p95 in milliseconds per chart and span over the recent history
+def summary():
+    with _history_lock:
+        items = [(key, list(values)) for key, values in _history.items()]
+    return [
+        {'chart': chart_name, 'span': span_name, 'count': len(values),
+         'p50_ms': _percentile(values, 0.5), 'p95_ms': _percentile(values, 0.95)}
+        for (chart_name, span_name), values in sorted(items, key=lambda item: (str(item[0][0]), item[0][1]))
+    ]
@@ -0,0 +1,151 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Synthesizer backed by Google Text-to-Speech (needs network access)
+class GTTSSynthesizer:
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+# Offline synthesizer for benchmarks: returns deterministic fake MP3 bytes
+# after an optional delay that simulates the synthesis round-trip
+class StubSynthesizer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def synthesize(self, text, lang):
+        if self.delay:
+            time.sleep(self.delay)
+        return b'ID3' + hashlib.sha256(f"{lang}:{text}".encode('utf-8')).digest()
+
+
+synthesizers = {
+    'gtts': GTTSSynthesizer,
+    'stub': StubSynthesizer,
+}
+
+
+def make_synthesizer(name, **kwargs):
+    try:
+        return synthesizers[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend {name!r}, expected one of {sorted(synthesizers)}")
+
+
+# Cache key: hash of the language and the text
+def audio_key(text, lang):
+    return hashlib.sha256(f"{lang}\0{text}".encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    # Content-addressed cache of synthesized MP3 audio. Clips live in a
+    # bounded in-memory LRU and in `directory` on disk, so each (text, lang)
+    # is synthesized once per server, not once per button click.
+    def __init__(self, synthesizer, directory='.tts_cache', lang='id', max_bytes=32 * 1024 * 1024, max_disk_bytes=256 * 1024 * 1024):
+        self.synthesizer = synthesizer
+        self.directory = directory
+        self.lang = lang
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tts')
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.mp3')
+
+    def _remember(self, key, audio):
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = audio
+            self._size += len(audio)
+            while self._size > self.max_bytes and len(self._memory) > 1:
+                _, dropped = self._memory.popitem(last=False)
+                self._size -= len(dropped)
+
+    # Return the MP3 bytes for `text`, synthesizing them only on a cold miss
+    def get(self, text, lang=None):
+        lang = lang or self.lang
+        key = audio_key(text, lang)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same clip wait for a single synthesis
+        with key_lock:
+            with self._lock:
+                audio = self._memory.get(key)
+            if audio is not None:
+                return audio
+
+            path = self._path(key)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    audio = f.read()
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                audio = self.synthesizer.synthesize(text, lang)
+                self._write(path, audio)
+                with self._lock:
+                    self.misses += 1
+            self._remember(key, audio)
+        return audio
+
+    # Write atomically so readers never see a half-written file
+    def _write(self, path, audio):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        self._trim_disk()
+
+    # Remove the least recently written clips once the directory is over its cap
+    def _trim_disk(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.mp3'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    # Synthesize clips in the background so the first click is already a hit
+    def pregenerate(self, texts, lang=None):
+        return [self._executor.submit(self.get, text, lang) for text in texts]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'clips': len(self._memory),
+                'bytes': self._size,
+            }